@@ -90,6 +90,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Global exception handler (must be near the top to catch all exceptions)
     'core.middleware.GlobalExceptionHandler',
+    # DEBUG-only N+1 watchdog (disables itself when DEBUG is off)
+    'core.middleware.QueryCountMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -206,7 +208,9 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        # orjson serializes datetimes/UUIDs in C instead of DRF's
+        # Python-level encoder dispatch — a large win on list payloads.
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
@@ -269,6 +273,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'task_queue.tasks.calculate_trends_task',
         'schedule': crontab(hour=0, minute=0),  # Daily at midnight
     },
+    'cleanup-expired-blacklist-hourly': {
+        'task': 'recommendations.tasks.cleanup_expired_blacklist_task',
+        'schedule': crontab(minute=15),  # Hourly at :15
+    },
+    'refresh-trending-view-every-5-min': {
+        'task': 'recommendations.tasks.refresh_trending_view_task',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
 }
 
 
@@ -11,6 +11,9 @@ import logging
 import traceback
 from typing import Dict, Any
 
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.http import Http404
@@ -202,3 +205,36 @@ class GlobalExceptionHandler:
         )
         
         # In production, this is where to send to Sentry, DataDog, etc.
+
+
+class QueryCountMiddleware:
+    """
+    DEBUG-only guardrail against query-count regressions.
+
+    Counts the SQL statements a request executed (connection.queries is
+    only populated under DEBUG) and logs a warning when an endpoint
+    exceeds the budget — the usual signature of a reintroduced N+1.
+    Purely observational: it never blocks or alters the response.
+    """
+
+    #: Generous per-request ceiling; well-behaved endpoints sit far below.
+    QUERY_BUDGET = 20
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries_before = len(connection.queries)
+        response = self.get_response(request)
+        executed = len(connection.queries) - queries_before
+        if executed > self.QUERY_BUDGET:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d queries (budget %d)",
+                request.method,
+                request.path,
+                executed,
+                self.QUERY_BUDGET,
+            )
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-09-01
+
+import geohash2
+from django.db import migrations, models
+
+
+def backfill_geohash(apps, schema_editor):
+    POI = apps.get_model('locations', 'POI')
+    batch = []
+    for poi in POI.objects.only('id', 'location').iterator():
+        if poi.location is None:
+            continue
+        poi.geohash_8 = geohash2.encode(poi.location.y, poi.location.x, precision=8)
+        batch.append(poi)
+        if len(batch) >= 1000:
+            POI.objects.bulk_update(batch, ['geohash_8'])
+            batch = []
+    if batch:
+        POI.objects.bulk_update(batch, ['geohash_8'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0003_rename_locations_s_user_id_xyz123_idx_locations_s_user_id_0871e5_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='poi',
+            name='geohash_8',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=8),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
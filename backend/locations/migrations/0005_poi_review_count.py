@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_review_count(apps, schema_editor):
+    POI = apps.get_model('locations', 'POI')
+    Review = apps.get_model('recommendations', 'Review')
+    counts = Review.objects.values('poi_id').annotate(n=Count('id'))
+    batch = []
+    poi_by_id = POI.objects.in_bulk([row['poi_id'] for row in counts])
+    for row in counts:
+        poi = poi_by_id.get(row['poi_id'])
+        if poi is None:
+            continue
+        poi.review_count = row['n']
+        batch.append(poi)
+        if len(batch) >= 1000:
+            POI.objects.bulk_update(batch, ['review_count'])
+            batch = []
+    if batch:
+        POI.objects.bulk_update(batch, ['review_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_poi_geohash_8'),
+        ('recommendations', '0008_mv_trending_24h'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='poi',
+            name='review_count',
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                help_text='Cached number of reviews, maintained by Review signals to avoid Count() joins on every read',
+            ),
+        ),
+        migrations.RunPython(backfill_review_count, migrations.RunPython.noop),
+    ]
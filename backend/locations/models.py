@@ -1,4 +1,6 @@
 import uuid
+
+import geohash2
 from django.db import models
 from django.contrib.gis.db import models as gis_models
 from django.contrib.gis.geos import Point
@@ -47,6 +49,11 @@ class POI(models.Model):
         default=0.0,
         help_text="Cached aggregate rating (0.0 - 5.0) to avoid joining review tables on every read"
     )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Cached number of reviews, maintained by Review signals to avoid Count() joins on every read"
+    )
     
     # External Integration
     external_id = models.CharField(
@@ -71,10 +78,15 @@ class POI(models.Model):
         help_text="List of keywords used for vector similarity matching in the Recommendation Engine"
     )
     
+    # Geohash bucket (precision 8, ~38m x 19m cells), derived from location
+    # on save. Prefix matches against this indexed column coarse-filter
+    # radius queries before the expensive per-row distance math runs.
+    geohash_8 = models.CharField(max_length=8, blank=True, default='', db_index=True)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     class Meta:
         db_table = 'locations_poi'
         indexes = [
@@ -96,7 +108,8 @@ class POI(models.Model):
             lon = self.location.x
             if not (-90 <= lat <= 90 and -180 <= lon <= 180):
                 raise ValueError("Invalid coordinates: latitude must be -90 to 90, longitude must be -180 to 180")
-        
+            self.geohash_8 = geohash2.encode(lat, lon, precision=8)
+
         super().save(*args, **kwargs)
     
     def distance_to(self, target_point):
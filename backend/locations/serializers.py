@@ -90,11 +90,19 @@ class POIListSerializer(serializers.ModelSerializer):
         ]
     
     def get_latitude(self, obj):
+        # Prefer the ST_Y annotation set by list querysets that defer the
+        # raw geometry column; fall back to the GEOS point.
+        latitude = getattr(obj, 'point_latitude', None)
+        if latitude is not None:
+            return latitude
         if obj.location:
             return obj.location.y
         return None
-    
+
     def get_longitude(self, obj):
+        longitude = getattr(obj, 'point_longitude', None)
+        if longitude is not None:
+            return longitude
         if obj.location:
             return obj.location.x
         return None
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifications'
+
+    def ready(self):
+        # Warm the Firebase client at startup so the first request does not
+        # pay for credential discovery (and so --preload workers share it).
+        from .services import get_push_service
+
+        get_push_service()
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_product_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='devicetoken',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['user'],
+                name='dt_user_active_idx',
+            ),
+        ),
+    ]
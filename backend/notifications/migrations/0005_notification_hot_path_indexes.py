@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_devicetoken_partial_active_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(
+                fields=['recipient', 'is_read', '-created_at'],
+                name='notif_recip_unread_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(
+                fields=['recipient', 'verb', '-created_at'],
+                name='notif_recip_verb_created_idx',
+            ),
+        ),
+    ]
@@ -108,6 +108,16 @@ class Notification(models.Model):
             models.Index(fields=['recipient', 'category', 'created_at']),
             models.Index(fields=['recipient', 'verb', 'target_object_ref']),
             models.Index(fields=['created_at']),
+            # Covers the hot filter+sort pairs: unread list / unread_count and
+            # by_verb, each ordered by newest first.
+            models.Index(
+                fields=['recipient', 'is_read', '-created_at'],
+                name='notif_recip_unread_created_idx',
+            ),
+            models.Index(
+                fields=['recipient', 'verb', '-created_at'],
+                name='notif_recip_verb_created_idx',
+            ),
         ]
         ordering = ['-created_at']
     
@@ -188,6 +198,13 @@ class DeviceToken(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_active']),
             models.Index(fields=['token']),
+            # Partial index for the hot send path: send_to_user only ever reads
+            # active tokens, so keep a small is_active=True-only index on PG.
+            models.Index(
+                fields=['user'],
+                condition=models.Q(is_active=True),
+                name='dt_user_active_idx',
+            ),
         ]
     
     def __str__(self):
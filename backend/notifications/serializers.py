@@ -194,6 +194,7 @@ class BulkNotificationSerializer(serializers.Serializer):
     """Serializer for bulk operations on notifications"""
     notification_ids = serializers.ListField(
         child=serializers.UUIDField(),
+        max_length=100_000,
         help_text="List of notification IDs to update"
     )
     action = serializers.ChoiceField(
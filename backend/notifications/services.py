@@ -2,9 +2,15 @@
 Push notification service using Firebase Cloud Messaging (FCM).
 Handles device token management and message dispatching.
 """
+import json
 import logging
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, transaction
 
 from .models import DeviceToken, Notification, NotificationCategory, NotificationVerb
 from user.models import UserProfile
@@ -85,9 +91,15 @@ class NotificationService:
                     dedupe_key=dedupe_key,
                     defaults=defaults,
                 )
-                return notification
+            else:
+                notification = Notification.objects.create(**defaults)
 
-            return Notification.objects.create(**defaults)
+        # New unread row: drop the cached badge state so the next poll refetches.
+        cache.delete_many([
+            f"notif:unread:{recipient.id}",
+            f"notif:hasunread:{recipient.id}",
+        ])
+        return notification
 
     @classmethod
     def notify_post_like(cls, post, actor: UserProfile):
@@ -226,6 +238,48 @@ except ImportError:
     logger.warning("Firebase Admin SDK not installed. Push notifications disabled.")
 
 
+# FCM's topic-management API accepts at most 1000 tokens per call.
+_TOPIC_BATCH_SIZE = 1000
+
+# Shared read-only empty payload; avoids allocating a fresh dict for every
+# data-less send (MulticastMessage accepts read-only mappings).
+_EMPTY_DATA = types.MappingProxyType({})
+
+
+def _run_topic_batches(operation, tokens: List[str], topic: str) -> list:
+    """
+    Split tokens into FCM-sized batches and run the topic operation on each,
+    concurrently when more than one batch is needed. A 10k-token subscribe
+    otherwise serializes into 10 blocking HTTP calls.
+    """
+    chunks = [tokens[i:i + _TOPIC_BATCH_SIZE] for i in range(0, len(tokens), _TOPIC_BATCH_SIZE)]
+    if len(chunks) <= 1:
+        return [operation(tokens, topic)]
+    with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as pool:
+        return list(pool.map(lambda chunk: operation(chunk, topic), chunks))
+
+
+@lru_cache(maxsize=256)
+def _cached_payload(title: str, body: str, data_json: str):
+    """Memoized payload parts keyed on the normalized content."""
+    return (
+        messaging.Notification(title=title, body=body),
+        json.loads(data_json) if data_json else _EMPTY_DATA,
+    )
+
+
+def build_payload(title: str, body: str, data: Optional[dict] = None):
+    """
+    Build (and memoize) the FCM notification object + data dict for a message.
+
+    Broadcast-style callers fan the same title/body/data out to many users;
+    memoizing avoids re-validating and re-encoding the identical payload for
+    every recipient.
+    """
+    data_json = json.dumps(data, sort_keys=True) if data else ""
+    return _cached_payload(title, body, data_json)
+
+
 class PushService:
     """
     Wrapper class for Firebase Cloud Messaging (FCM) Admin SDK.
@@ -256,7 +310,7 @@ class PushService:
                         self.fcm_client = firebase_admin.get_app()
                 logger.info("Firebase Admin SDK initialized successfully")
             except Exception as e:
-                logger.error(f"Failed to initialize Firebase Admin SDK: {str(e)}")
+                logger.error("Failed to initialize Firebase Admin SDK: %s", e)
                 self.fcm_client = None
     
     def register_device(self, user, token: str, platform: str) -> bool:
@@ -272,20 +326,21 @@ class PushService:
             bool: True if successful, False otherwise
         """
         try:
-            with transaction.atomic():
-                device_token, created = DeviceToken.objects.update_or_create(
-                    token=token,
-                    defaults={
-                        'user': user,
-                        'platform': platform,
-                        'is_active': True
-                    }
-                )
-                action = "created" if created else "updated"
-                logger.info(f"Device token {action} for user {user.username}")
-                return True
+            # update_or_create is already atomic on its own; wrapping it again
+            # only adds savepoint round-trips under ATOMIC_REQUESTS.
+            device_token, created = DeviceToken.objects.update_or_create(
+                token=token,
+                defaults={
+                    'user': user,
+                    'platform': platform,
+                    'is_active': True
+                }
+            )
+            action = "created" if created else "updated"
+            logger.info("Device token %s for user %s", action, user.username)
+            return True
         except Exception as e:
-            logger.error(f"Error registering device token: {str(e)}")
+            logger.error("Error registering device token: %s", e)
             return False
     
     def send_to_user(self, user_id, title: str, body: str, data: dict = None) -> int:
@@ -318,18 +373,16 @@ class PushService:
             ).values_list('token', flat=True)
             
             if not device_tokens:
-                logger.warning(f"No active device tokens found for user {user_id}")
+                logger.warning("No active device tokens found for user %s", user_id)
                 return 0
             
             token_list = list(device_tokens)
-            data = data or {}
-            
-            # Create multicast message
+
+            # Create multicast message (payload parts are memoized across
+            # callers sending the same content to many users)
+            notification, data = build_payload(title, body, data)
             message = messaging.MulticastMessage(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
+                notification=notification,
                 data=data,
                 tokens=token_list
             )
@@ -339,23 +392,23 @@ class PushService:
             
             # Process failures
             if response.failure_count > 0:
-                failed_tokens = []
-                for idx, resp in enumerate(response.responses):
-                    if not resp.success:
-                        failed_tokens.append(token_list[idx])
-                
+                failed_tokens = [
+                    token for token, resp in zip(token_list, response.responses)
+                    if not resp.success
+                ]
+
                 # Clean up invalid tokens
                 if failed_tokens:
                     self.cleanup_invalid_tokens(failed_tokens)
             
             logger.info(
-                f"Sent notification to user {user_id}: "
-                f"{response.success_count} succeeded, {response.failure_count} failed"
+                "Sent notification to user %s: %d succeeded, %d failed",
+                user_id, response.success_count, response.failure_count,
             )
             return response.success_count
             
         except Exception as e:
-            logger.error(f"Error sending notification to user {user_id}: {str(e)}")
+            logger.error("Error sending notification to user %s: %s", user_id, e)
             return 0
     
     def cleanup_invalid_tokens(self, failures: List[str]) -> None:
@@ -367,15 +420,20 @@ class PushService:
         """
         if not failures:
             return
-        
+
         try:
-            with transaction.atomic():
-                deleted_count, _ = DeviceToken.objects.filter(
-                    token__in=failures
-                ).delete()
-                logger.info(f"Cleaned up {deleted_count} invalid device tokens")
+            # Raw DELETE avoids the SELECT-then-DELETE round-trip the ORM does
+            # for signal dispatch. Safe here: DeviceToken has no cascading
+            # children and no delete signal handlers.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {DeviceToken._meta.db_table} WHERE token = ANY(%s)",
+                    [list(failures)],
+                )
+                deleted_count = cursor.rowcount
+            logger.info("Cleaned up %d invalid device tokens", deleted_count)
         except Exception as e:
-            logger.error(f"Error cleaning up invalid tokens: {str(e)}")
+            logger.error("Error cleaning up invalid tokens: %s", e)
     
     def send_broadcast(self, topic: str, message: str) -> bool:
         """
@@ -402,11 +460,11 @@ class PushService:
             )
             
             response = messaging.send(fcm_message)
-            logger.info(f"Broadcast sent to topic '{topic}'. Message ID: {response}")
+            logger.info("Broadcast sent to topic '%s'. Message ID: %s", topic, response)
             return True
             
         except Exception as e:
-            logger.error(f"Error sending broadcast to topic '{topic}': {str(e)}")
+            logger.error("Error sending broadcast to topic '%s': %s", topic, e)
             return False
     
     def subscribe_to_topic(self, tokens: List[str], topic: str) -> bool:
@@ -425,11 +483,11 @@ class PushService:
             return False
         
         try:
-            response = messaging.subscribe_to_topic(tokens, topic)
-            logger.info(f"Subscribed {len(tokens)} devices to topic '{topic}'")
+            _run_topic_batches(messaging.subscribe_to_topic, list(tokens), topic)
+            logger.info("Subscribed %d devices to topic '%s'", len(tokens), topic)
             return True
         except Exception as e:
-            logger.error(f"Error subscribing to topic '{topic}': {str(e)}")
+            logger.error("Error subscribing to topic '%s': %s", topic, e)
             return False
     
     def unsubscribe_from_topic(self, tokens: List[str], topic: str) -> bool:
@@ -448,29 +506,35 @@ class PushService:
             return False
         
         try:
-            response = messaging.unsubscribe_from_topic(tokens, topic)
-            logger.info(f"Unsubscribed {len(tokens)} devices from topic '{topic}'")
+            _run_topic_batches(messaging.unsubscribe_from_topic, list(tokens), topic)
+            logger.info("Unsubscribed %d devices from topic '%s'", len(tokens), topic)
             return True
         except Exception as e:
-            logger.error(f"Error unsubscribing from topic '{topic}': {str(e)}")
+            logger.error("Error unsubscribing from topic '%s': %s", topic, e)
             return False
 
 
 # Global instance for easy access
 _push_service = None
+_push_service_lock = threading.Lock()
 
 
 def get_push_service(credentials_path: Optional[str] = None) -> PushService:
     """
     Get or create a global PushService instance.
-    
+
+    Double-checked locking so concurrent threads (gunicorn --threads) cannot
+    both run firebase_admin.initialize_app, which raises on a second init.
+
     Args:
         credentials_path: Optional path to Firebase credentials file
-    
+
     Returns:
         PushService: The push service instance
     """
     global _push_service
     if _push_service is None:
-        _push_service = PushService(credentials_path)
+        with _push_service_lock:
+            if _push_service is None:
+                _push_service = PushService(credentials_path)
     return _push_service
@@ -0,0 +1,52 @@
+"""
+Celery tasks for the notifications app.
+
+Device registration is persisted synchronously in the view; the
+PushService-side work (Firebase client init, future FCM token validation /
+topic subscription) runs here so the request path stays DB-write-bound.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def register_device_task(self, user_id: int, token: str, platform: str):
+    """
+    Complete device registration with the push provider off the request path.
+
+    Falls back to deactivating the stored token if the provider-side
+    registration keeps failing, so dead tokens don't linger as active.
+
+    Args:
+        user_id: Primary key of the Django User who owns the device
+        token: FCM device token string
+        platform: Device platform (iOS, ANDROID, WEB)
+
+    Returns:
+        bool: True if the push-service registration succeeded
+    """
+    from django.contrib.auth.models import User
+
+    from .models import DeviceToken
+    from .services import get_push_service
+
+    try:
+        user = User.objects.get(pk=user_id)
+        success = get_push_service().register_device(
+            user=user,
+            token=token,
+            platform=platform,
+        )
+    except User.DoesNotExist:
+        logger.warning("Device registration skipped: user %s no longer exists", user_id)
+        return False
+    except Exception as exc:
+        logger.error("Device registration task failed for user %s: %s", user_id, exc)
+        raise self.retry(exc=exc)
+
+    if not success:
+        DeviceToken.objects.filter(token=token).update(is_active=False)
+    return success
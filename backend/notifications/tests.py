@@ -9,27 +9,28 @@ import uuid
 
 class NotificationModelTest(TestCase):
     """Test cases for Notification model"""
-    
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up invariant fixtures once per class instead of per test"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         # Ensure profile exists to avoid RelatedObjectDoesNotExist
-        UserProfile.objects.get_or_create(user=self.user)
+        UserProfile.objects.get_or_create(user=cls.user)
 
-        self.actor_user = User.objects.create_user(
+        cls.actor_user = User.objects.create_user(
             username='actor',
             email='actor@example.com',
             password='testpass123'
         )
         # Ensure profile exists
-        UserProfile.objects.get_or_create(user=self.actor_user)
+        UserProfile.objects.get_or_create(user=cls.actor_user)
 
-        self.recipient_profile = self.user.profile
-        self.actor_profile = self.actor_user.profile
+        cls.recipient_profile = cls.user.profile
+        cls.actor_profile = cls.actor_user.profile
     
     def test_notification_creation(self):
         """Test creating a notification"""
@@ -140,10 +141,11 @@ class NotificationModelTest(TestCase):
 
 class DeviceTokenModelTest(TestCase):
     """Test cases for DeviceToken model"""
-    
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up invariant fixtures once per class instead of per test"""
+        cls.user = User.objects.create_user(
             username='deviceuser',
             email='device@example.com',
             password='testpass123'
@@ -182,17 +184,11 @@ class DeviceTokenModelTest(TestCase):
     
     def test_multiple_tokens_per_user(self):
         """Test that a user can have multiple device tokens"""
-        token1 = DeviceToken.objects.create(
-            user=self.user,
-            token='token_1',
-            platform=DevicePlatform.ANDROID
-        )
-        token2 = DeviceToken.objects.create(
-            user=self.user,
-            token='token_2',
-            platform=DevicePlatform.iOS
-        )
-        
+        DeviceToken.objects.bulk_create([
+            DeviceToken(user=self.user, token='token_1', platform=DevicePlatform.ANDROID),
+            DeviceToken(user=self.user, token='token_2', platform=DevicePlatform.iOS),
+        ])
+
         user_tokens = DeviceToken.objects.filter(user=self.user)
         self.assertEqual(user_tokens.count(), 2)
 
@@ -209,11 +205,17 @@ class DeviceTokenModelTest(TestCase):
 
 class PushServiceTest(TestCase):
     """Test cases for PushService"""
-    
-    def setUp(self):
-        """Set up test data"""
-        self.push_service = PushService()
-        self.user = User.objects.create_user(
+
+    @classmethod
+    def setUpClass(cls):
+        """Instantiate the service once; tests never mutate it"""
+        super().setUpClass()
+        cls.push_service = PushService()
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up invariant fixtures once per class instead of per test"""
+        cls.user = User.objects.create_user(
             username='pushuser',
             email='push@example.com',
             password='testpass123'
@@ -264,17 +266,11 @@ class PushServiceTest(TestCase):
     
     def test_cleanup_invalid_tokens(self):
         """Test cleaning up invalid tokens"""
-        token1 = DeviceToken.objects.create(
-            user=self.user,
-            token='invalid_token_1',
-            platform=DevicePlatform.ANDROID
-        )
-        token2 = DeviceToken.objects.create(
-            user=self.user,
-            token='invalid_token_2',
-            platform=DevicePlatform.iOS
-        )
-        
+        DeviceToken.objects.bulk_create([
+            DeviceToken(user=self.user, token='invalid_token_1', platform=DevicePlatform.ANDROID),
+            DeviceToken(user=self.user, token='invalid_token_2', platform=DevicePlatform.iOS),
+        ])
+
         # Cleanup
         self.push_service.cleanup_invalid_tokens(['invalid_token_1', 'invalid_token_2'])
         
@@ -2,7 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from core.exceptions import NotFoundException
+from user.models import UserProfile
 
 from .models import Notification, DeviceToken, NotificationVerb
 from .serializers import (
@@ -14,7 +20,61 @@ from .serializers import (
     DeviceTokenRegisterSerializer,
     BulkNotificationSerializer,
 )
-from .services import get_push_service
+from .tasks import register_device_task
+
+
+# Mobile clients poll unread_count on every foreground; keep the COUNT(*)
+# result in Redis briefly and drop it whenever read-state changes.
+UNREAD_COUNT_TTL = 30
+
+# Bulk id lists are processed in bounded IN (...) batches.
+BULK_ID_CHUNK_SIZE = 10_000
+
+# NotificationVerb.values rebuilds a list on every access; freeze it once for
+# the per-request membership checks.
+_VERB_SET = frozenset(NotificationVerb.values)
+_INVALID_VERB_MSG = f'Invalid verb. Must be one of: {", ".join(NotificationVerb.values)}'
+
+
+def unread_count_cache_key(profile_id) -> str:
+    return f"notif:unread:{profile_id}"
+
+
+# "Any unread at all?" is cheaper than the exact count and polled even more
+# aggressively by badge UIs; cache the boolean briefly.
+HAS_UNREAD_TTL = 10
+
+
+def has_unread_cache_key(profile_id) -> str:
+    return f"notif:hasunread:{profile_id}"
+
+
+def invalidate_unread_caches(profile_id) -> None:
+    cache.delete_many([
+        unread_count_cache_key(profile_id),
+        has_unread_cache_key(profile_id),
+    ])
+
+
+# Columns NotificationListSerializer actually renders (plus the joined actor
+# fields it dereferences); keeps list SELECTs narrow.
+NOTIFICATION_LIST_FIELDS = (
+    'id',
+    'verb',
+    'category',
+    'title',
+    'body',
+    'target_object_id',
+    'target_object_ref',
+    'is_read',
+    'data',
+    'created_at',
+    'recipient_id',
+    'actor__id',
+    'actor__avatar_url',
+    'actor__user__id',
+    'actor__user__username',
+)
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -46,31 +106,42 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return NotificationUpdateSerializer
         return NotificationSerializer
     
+    @cached_property
+    def _profile(self):
+        """Current user's profile, fetched at most once per request."""
+        try:
+            return self.request.user.profile
+        except UserProfile.DoesNotExist:
+            raise NotFoundException('User profile not found.')
+
     def get_queryset(self):
         """Return notifications for the current user"""
-        user = self.request.user
-        try:
-            user_profile = user.profile
-            queryset = Notification.objects.filter(recipient=user_profile)
-            
-            # Filter by read status if provided
-            is_read = self.request.query_params.get('is_read')
-            if is_read is not None:
-                is_read = is_read.lower() == 'true'
-                queryset = queryset.filter(is_read=is_read)
-            
-            # Filter by verb if provided
-            verb = self.request.query_params.get('verb')
-            if verb and verb in NotificationVerb.values:
-                queryset = queryset.filter(verb=verb)
-
-            category = self.request.query_params.get('category')
-            if category:
-                queryset = queryset.filter(category=category.upper())
-            
-            return queryset.order_by('-created_at')
-        except:
-            return Notification.objects.none()
+        # Serializers traverse actor.user (username/avatar) and recipient,
+        # so join them up front instead of one query per row.
+        queryset = Notification.objects.select_related(
+            'recipient',
+            'actor__user',
+        ).filter(recipient=self._profile)
+
+        # Filter by read status if provided
+        is_read = self.request.query_params.get('is_read')
+        if is_read is not None:
+            is_read = is_read.lower() == 'true'
+            queryset = queryset.filter(is_read=is_read)
+
+        # Filter by verb if provided
+        verb = self.request.query_params.get('verb')
+        if verb and verb in _VERB_SET:
+            queryset = queryset.filter(verb=verb)
+
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category=category.upper())
+
+        if self.action == 'list':
+            queryset = queryset.only(*NOTIFICATION_LIST_FIELDS)
+
+        return queryset.order_by('-created_at')
     
     def perform_create(self, serializer):
         """Create a notification"""
@@ -87,61 +158,88 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'])
     def mark_as_read(self, request, pk=None):
         """Mark a single notification as read"""
-        notification = self.get_object()
-        notification.mark_as_read()
-        serializer = self.get_serializer(notification)
-        return Response(serializer.data)
-    
+        return self._set_read_state(pk, is_read=True)
+
     @action(detail=True, methods=['patch'])
     def mark_as_unread(self, request, pk=None):
         """Mark a single notification as unread"""
-        notification = self.get_object()
-        notification.is_read = False
-        notification.save(update_fields=['is_read', 'updated_at'])
+        return self._set_read_state(pk, is_read=False)
+
+    def _set_read_state(self, pk, *, is_read):
+        """Flip is_read with one targeted UPDATE instead of fetch-then-save"""
+        updated = self.get_queryset().filter(pk=pk).update(
+            is_read=is_read,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return Response(
+                {'error': 'Notification not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        invalidate_unread_caches(self._profile.id)
+        notification = self.get_queryset().get(pk=pk)
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
         """Mark all unread notifications as read"""
-        user = request.user
-        try:
-            user_profile = user.profile
-            updated_count, _ = Notification.objects.filter(
-                recipient=user_profile,
+        cache_key = unread_count_cache_key(self._profile.id)
+        with transaction.atomic():
+            updated_count = Notification.objects.filter(
+                recipient=self._profile,
                 is_read=False
             ).update(is_read=True, updated_at=timezone.now())
-            
-            return Response(
-                {'message': f'Marked {updated_count} notifications as read'},
-                status=status.HTTP_200_OK
-            )
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
+            # The count is now known to be zero: push it instead of deleting,
+            # so the next badge poll is a cache hit rather than a COUNT scan.
+            # on_commit keeps the cache honest if the transaction rolls back.
+            transaction.on_commit(
+                lambda: (
+                    cache.set(cache_key, 0, UNREAD_COUNT_TTL),
+                    cache.set(has_unread_cache_key(self._profile.id), False, HAS_UNREAD_TTL),
+                )
             )
+
+        return Response(
+            {'message': f'Marked {updated_count} notifications as read'},
+            status=status.HTTP_200_OK
+        )
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications for current user"""
-        user = request.user
-        try:
-            user_profile = user.profile
+        cache_key = unread_count_cache_key(self._profile.id)
+        count = cache.get(cache_key)
+        if count is None:
             count = Notification.objects.filter(
-                recipient=user_profile,
+                recipient=self._profile,
                 is_read=False
             ).count()
-            
-            return Response(
-                {'unread_count': count},
-                status=status.HTTP_200_OK
-            )
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            cache.set(cache_key, count, UNREAD_COUNT_TTL)
+
+        return Response(
+            {'unread_count': count},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['get'])
+    def has_unread(self, request):
+        """Cheap boolean check for clients that only need the badge dot"""
+        cache_key = has_unread_cache_key(self._profile.id)
+        value = cache.get(cache_key)
+        if value is None:
+            # exists() lets Postgres stop at the first matching row instead
+            # of counting everything.
+            value = Notification.objects.filter(
+                recipient=self._profile,
+                is_read=False
+            ).exists()
+            cache.set(cache_key, value, HAS_UNREAD_TTL)
+
+        return Response(
+            {'has_unread': value},
+            status=status.HTTP_200_OK
+        )
     
     @action(detail=False, methods=['post'])
     def bulk_update(self, request):
@@ -150,66 +248,67 @@ class NotificationViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        user = request.user
         notification_ids = serializer.validated_data['notification_ids']
         action_type = serializer.validated_data['action']
-        
-        try:
-            user_profile = user.profile
-            # Ensure user can only modify their own notifications
-            queryset = Notification.objects.filter(
-                recipient=user_profile,
-                id__in=notification_ids
-            )
-            
-            if action_type == 'mark_as_read':
-                updated_count, _ = queryset.update(is_read=True, updated_at=timezone.now())
-            elif action_type == 'mark_as_unread':
-                updated_count, _ = queryset.update(is_read=False, updated_at=timezone.now())
-            elif action_type == 'delete':
-                updated_count, _ = queryset.delete()
-            else:
-                return Response(
-                    {'error': f'Unknown action: {action_type}'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            return Response(
-                {'message': f'Updated {updated_count} notifications', 'count': updated_count},
-                status=status.HTTP_200_OK
-            )
-        except Exception as e:
+
+        if action_type not in ('mark_as_read', 'mark_as_unread', 'delete'):
             return Response(
-                {'error': str(e)},
+                {'error': f'Unknown action: {action_type}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+        now = timezone.now()
+        updated_count = 0
+
+        # Chunk the ids so a huge payload never becomes one giant
+        # IN (...) clause the planner has to chew through.
+        with transaction.atomic():
+            for start in range(0, len(notification_ids), BULK_ID_CHUNK_SIZE):
+                chunk = notification_ids[start:start + BULK_ID_CHUNK_SIZE]
+                # Ensure user can only modify their own notifications
+                queryset = Notification.objects.filter(
+                    recipient=self._profile,
+                    id__in=chunk
+                )
+
+                if action_type == 'mark_as_read':
+                    updated_count += queryset.update(is_read=True, updated_at=now)
+                elif action_type == 'mark_as_unread':
+                    updated_count += queryset.update(is_read=False, updated_at=now)
+                else:
+                    deleted, _ = queryset.delete()
+                    updated_count += deleted
+
+        invalidate_unread_caches(self._profile.id)
+
+        return Response(
+            {'message': f'Updated {updated_count} notifications', 'count': updated_count},
+            status=status.HTTP_200_OK
+        )
     
     @action(detail=False, methods=['get'])
     def by_verb(self, request):
         """Filter notifications by verb/type"""
         verb = request.query_params.get('verb')
         
-        if not verb or verb not in NotificationVerb.values:
+        if not verb or verb not in _VERB_SET:
             return Response(
-                {'error': f'Invalid verb. Must be one of: {", ".join(NotificationVerb.values)}'},
+                {'error': _INVALID_VERB_MSG},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        user = request.user
-        try:
-            user_profile = user.profile
-            notifications = Notification.objects.filter(
-                recipient=user_profile,
-                verb=verb
-            ).order_by('-created_at')
-            
-            serializer = self.get_serializer(notifications, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # Reuse get_queryset so the select_related joins apply here too
+        notifications = self.get_queryset().filter(verb=verb)
+
+        # Paginate: a user can accumulate thousands of one verb and the
+        # unbounded serialize-everything path materialized them all.
+        page = self.paginate_queryset(notifications)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(notifications, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class DeviceTokenViewSet(viewsets.ModelViewSet):
@@ -254,30 +353,27 @@ class DeviceTokenViewSet(viewsets.ModelViewSet):
         platform = serializer.validated_data['platform']
         
         try:
-            push_service = get_push_service()
-            success = push_service.register_device(
-                user=request.user,
+            # Persist the token immediately (DB-write-bound) and finish the
+            # provider-side registration asynchronously once we've committed.
+            device_token, _ = DeviceToken.objects.update_or_create(
                 token=token,
-                platform=platform
+                defaults={
+                    'user': request.user,
+                    'platform': platform,
+                    'is_active': True,
+                }
+            )
+            user_id = request.user.id
+            transaction.on_commit(
+                lambda: register_device_task.delay(user_id, token, platform)
+            )
+            return Response(
+                {
+                    'message': 'Device registered successfully',
+                    'device_id': device_token.id
+                },
+                status=status.HTTP_201_CREATED
             )
-            
-            if success:
-                device_token, _ = DeviceToken.objects.get_or_create(
-                    token=token,
-                    defaults={'user': request.user, 'platform': platform}
-                )
-                return Response(
-                    {
-                        'message': 'Device registered successfully',
-                        'device_id': device_token.id
-                    },
-                    status=status.HTTP_201_CREATED
-                )
-            else:
-                return Response(
-                    {'error': 'Failed to register device'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -294,20 +390,32 @@ class DeviceTokenViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def disable(self, request, pk=None):
         """Disable a device token"""
-        token = self.get_object()
-        token.is_active = False
-        token.save()
+        updated = self.get_queryset().filter(pk=pk).update(
+            is_active=False,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return Response(
+                {'error': 'Device token not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         return Response(
             {'message': 'Device token disabled'},
             status=status.HTTP_200_OK
         )
-    
+
     @action(detail=True, methods=['post'])
     def enable(self, request, pk=None):
         """Enable a device token"""
-        token = self.get_object()
-        token.is_active = True
-        token.save()
+        updated = self.get_queryset().filter(pk=pk).update(
+            is_active=True,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return Response(
+                {'error': 'Device token not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         return Response(
             {'message': 'Device token enabled'},
             status=status.HTTP_200_OK
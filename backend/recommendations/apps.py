@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RecommendationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recommendations'
+
+    def ready(self):
+        # Connect the Review receivers maintaining POI.review_count
+        from . import signals  # noqa: F401
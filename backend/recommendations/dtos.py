@@ -6,14 +6,14 @@ from typing import List, Optional
 from uuid import UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class PointDTO:
     """Represents a geographic point (latitude, longitude)"""
     latitude: float
     longitude: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextDTO:
     """
     Context information passed to the recommendation engine.
@@ -26,7 +26,7 @@ class ContextDTO:
     max_results: int = 10  # Number of recommendations to return
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoredPOI:
     """
     POI with its computed recommendation score.
@@ -48,7 +48,3 @@ class ScoredPOI:
     # Additional metadata
     distance_meters: Optional[float] = None
     tags: List[str] = field(default_factory=list)
-    
-    def __lt__(self, other):
-        """For sorting recommendations by score (highest first)"""
-        return self.final_score > other.final_score
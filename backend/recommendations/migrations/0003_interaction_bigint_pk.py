@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-09-01
+
+import uuid
+
+from django.db import migrations, models
+
+
+def backfill_interaction_uuids(apps, schema_editor):
+    Interaction = apps.get_model('recommendations', 'Interaction')
+    batch = []
+    for interaction in Interaction.objects.filter(uuid__isnull=True).only('pk').iterator():
+        interaction.uuid = uuid.uuid4()
+        batch.append(interaction)
+        if len(batch) >= 1000:
+            Interaction.objects.bulk_update(batch, ['uuid'])
+            batch = []
+    if batch:
+        Interaction.objects.bulk_update(batch, ['uuid'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_rename_recommendations_blacklisted_poi_expires_at_idx_recommendat_expires_4cd6ec_idx_and_more'),
+    ]
+
+    operations = [
+        # Swap the random-UUID PK for a sequential BIGINT on the hottest
+        # write table; keep the UUID as an external identifier.
+        migrations.RemoveField(
+            model_name='interaction',
+            name='id',
+        ),
+        migrations.AddField(
+            model_name='interaction',
+            name='id',
+            field=models.BigAutoField(primary_key=True, editable=False, serialize=False),
+        ),
+        # Three-step unique-field add (per the migrations docs): a
+        # default here would be evaluated once and stamp every existing
+        # row with the same uuid, breaking the unique alter below.
+        migrations.AddField(
+            model_name='interaction',
+            name='uuid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_interaction_uuids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interaction',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-09-01
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0003_interaction_bigint_pk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interaction',
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=['timestamp'],
+                name='interaction_ts_brin',
+                pages_per_range=32,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=['created_at'],
+                name='review_created_brin',
+                pages_per_range=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-09-01
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_time_range_brin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trendinglist',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['pois'],
+                name='trending_pois_gin',
+                opclasses=['jsonb_path_ops'],
+            ),
+        ),
+    ]
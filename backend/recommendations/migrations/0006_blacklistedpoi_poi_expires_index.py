@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0005_trendinglist_pois_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blacklistedpoi',
+            index=models.Index(
+                fields=['poi', 'expires_at'],
+                name='blacklist_poi_expires_idx',
+            ),
+        ),
+    ]
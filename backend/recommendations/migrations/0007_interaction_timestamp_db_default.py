@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0006_blacklistedpoi_poi_expires_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interaction',
+            name='timestamp',
+            field=models.DateTimeField(db_default=Now(), editable=False),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-09-01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 24h interaction velocity per (geohash cell, POI), precomputed so
+# trending reads are an indexed lookup. geohash_prefix comes from the
+# stored geohash_8 column rather than ST_GeoHash so the view needs no
+# geometry work. The unique index is required for REFRESH ... CONCURRENTLY.
+CREATE_VIEW_SQL = """
+CREATE MATERIALIZED VIEW mv_trending_24h AS
+SELECT i.poi_id AS poi_id,
+       COUNT(*) AS interaction_count,
+       SUBSTR(p.geohash_8, 1, 5) AS geohash_prefix
+FROM recommendations_interaction i
+JOIN locations_poi p ON p.id = i.poi_id
+WHERE i.timestamp >= now() - interval '24 hours'
+GROUP BY i.poi_id, SUBSTR(p.geohash_8, 1, 5);
+CREATE UNIQUE INDEX mv_trending_24h_gh_poi
+    ON mv_trending_24h (geohash_prefix, poi_id);
+"""
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS mv_trending_24h;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_poi_geohash_8'),
+        ('recommendations', '0007_interaction_timestamp_db_default'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TrendingVelocity',
+                    fields=[
+                        ('poi', models.OneToOneField(
+                            db_column='poi_id',
+                            on_delete=django.db.models.deletion.DO_NOTHING,
+                            primary_key=True,
+                            related_name='+',
+                            serialize=False,
+                            to='locations.poi',
+                        )),
+                        ('interaction_count', models.IntegerField()),
+                        ('geohash_prefix', models.CharField(max_length=5)),
+                    ],
+                    options={
+                        'db_table': 'mv_trending_24h',
+                        'managed': False,
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(sql=CREATE_VIEW_SQL, reverse_sql=DROP_VIEW_SQL),
+            ],
+        ),
+    ]
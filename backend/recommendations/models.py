@@ -1,5 +1,7 @@
 import uuid
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.db import models
+from django.db.models.functions import Now
 from django.core.validators import MinValueValidator, MaxValueValidator
 from locations.models import POI
 from user.models import UserProfile
@@ -19,8 +21,13 @@ class Interaction(models.Model):
     """
     Records user interactions with POIs for reinforcement learning.
     Used by ScoringService.update_user_vector() to refine user preference vectors.
+
+    This is the write-hottest table in the app, so the PK is a sequential
+    BIGINT (random UUID PKs split B-tree pages on every INSERT); the UUID
+    lives on as an external identifier.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.BigAutoField(primary_key=True, editable=False)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='interactions')
     poi = models.ForeignKey(POI, on_delete=models.CASCADE, related_name='interactions')
     interaction_type = models.CharField(
@@ -28,13 +35,19 @@ class Interaction(models.Model):
         choices=InteractionType.choices,
         help_text="Type of user interaction: VIEW, LIKE, SHARE, VISIT, CLICK, CHECK_IN"
     )
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # DB-side default instead of auto_now_add: the server stamps the row,
+    # so bulk inserts can omit the column entirely.
+    timestamp = models.DateTimeField(db_default=Now(), editable=False)
     
     class Meta:
         db_table = 'recommendations_interaction'
         indexes = [
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['poi', 'timestamp']),
+            # Tiny block-range index for cross-user time-window scans
+            # (trending/seasonal analytics); the table is append-only so
+            # timestamp correlates tightly with physical order.
+            BrinIndex(fields=['timestamp'], name='interaction_ts_brin', pages_per_range=32),
         ]
     
     def __str__(self):
@@ -63,6 +76,7 @@ class Review(models.Model):
         indexes = [
             models.Index(fields=['poi', 'rating']),
             models.Index(fields=['created_at']),
+            BrinIndex(fields=['created_at'], name='review_created_brin', pages_per_range=32),
         ]
         unique_together = ('user', 'poi')
     
@@ -92,6 +106,9 @@ class TrendingList(models.Model):
         db_table = 'recommendations_trending_list'
         indexes = [
             models.Index(fields=['geohash']),
+            # jsonb containment probes ("is POI X trending anywhere?") hit
+            # this instead of scanning every row's pois list client-side.
+            GinIndex(fields=['pois'], name='trending_pois_gin', opclasses=['jsonb_path_ops']),
         ]
     
     def __str__(self):
@@ -113,6 +130,9 @@ class BlacklistedPOI(models.Model):
         db_table = 'recommendations_blacklisted_poi'
         indexes = [
             models.Index(fields=['expires_at']),
+            # "Is this POI currently blacklisted?" — one probe on
+            # (poi, expires_at > now) instead of a PK lookup plus filter.
+            models.Index(fields=['poi', 'expires_at'], name='blacklist_poi_expires_idx'),
         ]
     
     def __str__(self):
@@ -149,3 +169,29 @@ class SeasonalMetadata(models.Model):
     
     def __str__(self):
         return f"Seasonal data for {self.poi.name}"
+
+
+class TrendingVelocity(models.Model):
+    """
+    Read-only mapping of the mv_trending_24h materialized view: per-POI
+    interaction counts over the trailing 24 hours, keyed by the POI's
+    precision-5 geohash cell. Refreshed every 5 minutes by
+    recommendations.tasks.refresh_trending_view_task, so trending reads
+    become an indexed lookup instead of a live GROUP BY.
+    """
+    poi = models.OneToOneField(
+        POI,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='poi_id',
+        related_name='+',
+    )
+    interaction_count = models.IntegerField()
+    geohash_prefix = models.CharField(max_length=5)
+
+    class Meta:
+        managed = False
+        db_table = 'mv_trending_24h'
+
+    def __str__(self):
+        return f"Velocity {self.interaction_count} for {self.poi_id} in {self.geohash_prefix}"
@@ -11,8 +11,8 @@ from user.serializers import UserProfileSerializer
 class InteractionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Interaction
-        fields = ['id', 'user', 'poi', 'interaction_type', 'timestamp']
-        read_only_fields = ['id', 'user', 'timestamp']
+        fields = ['id', 'uuid', 'user', 'poi', 'interaction_type', 'timestamp']
+        read_only_fields = ['id', 'uuid', 'user', 'timestamp']
 
 
 class ReviewSerializer(serializers.ModelSerializer):
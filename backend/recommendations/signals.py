@@ -0,0 +1,29 @@
+"""
+Signal receivers keeping denormalized POI columns in step with reviews.
+
+POI.review_count is a write-through counter: reviews change far less
+often than they are read, so paying one atomic UPDATE per write beats
+re-running Count('reviews') on every underrated-places query.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from locations.models import POI
+
+from .models import Review
+
+
+@receiver(post_save, sender=Review, dispatch_uid='review_count_incr')
+def increment_review_count(sender, instance, created, **kwargs):
+    """Bump the POI's cached review counter when a review is created."""
+    if created:
+        POI.objects.filter(pk=instance.poi_id).update(review_count=F('review_count') + 1)
+
+
+@receiver(post_delete, sender=Review, dispatch_uid='review_count_decr')
+def decrement_review_count(sender, instance, **kwargs):
+    """Drop the POI's cached review counter when a review is deleted."""
+    POI.objects.filter(pk=instance.poi_id, review_count__gt=0).update(
+        review_count=F('review_count') - 1
+    )
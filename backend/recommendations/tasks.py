@@ -0,0 +1,85 @@
+"""
+Celery tasks for the recommendations app.
+
+Seasonal trend analysis scans the full interaction history, so it runs
+here instead of inside the request/response cycle; the triggering view
+only enqueues and returns the task id. Blacklist cleanup is scheduled
+via Celery Beat (see CELERY_BEAT_SCHEDULE in config/settings.py).
+"""
+import logging
+
+from celery import group, shared_task
+
+logger = logging.getLogger(__name__)
+
+# Number of uuid-mod shards the seasonal aggregate is split into. Small
+# enough that per-task dispatch overhead stays negligible, large enough
+# to keep a typical worker pool busy.
+SEASONAL_SHARD_COUNT = 16
+
+
+@shared_task
+def analyze_seasonal_trends_task():
+    """
+    Fan the seasonal trend aggregation out across id shards.
+
+    Each shard runs as its own worker task, so the wall-clock time
+    scales down with the number of Celery workers.
+
+    Returns:
+        str: Group id of the dispatched shard tasks
+    """
+    shards = group(
+        analyze_seasonal_bucket_task.s(bucket, SEASONAL_SHARD_COUNT)
+        for bucket in range(SEASONAL_SHARD_COUNT)
+    )
+    return shards.apply_async().id
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def analyze_seasonal_bucket_task(self, bucket: int, num_buckets: int = SEASONAL_SHARD_COUNT):
+    """
+    Aggregate seasonal metadata for one uuid-mod shard of POIs.
+
+    Returns:
+        bool: True when the shard completed
+    """
+    from .trend_analyzer import TrendAnalyzer
+
+    try:
+        TrendAnalyzer().analyze_seasonal_trends(bucket=bucket, num_buckets=num_buckets)
+    except Exception as exc:
+        logger.error("Seasonal trend shard %s/%s failed: %s", bucket, num_buckets, exc)
+        raise self.retry(exc=exc)
+    return True
+
+
+@shared_task
+def cleanup_expired_blacklist_task():
+    """
+    Periodic job: purge expired BlacklistedPOI entries.
+
+    Returns:
+        int: Number of expired entries removed
+    """
+    from .trend_analyzer import TrendAnalyzer
+
+    return TrendAnalyzer().cleanup_expired_blacklist()
+
+
+@shared_task
+def refresh_trending_view_task():
+    """
+    Periodic job: refresh the mv_trending_24h materialized view.
+
+    CONCURRENTLY keeps reads unblocked during the refresh; the view's
+    unique (geohash_prefix, poi_id) index makes that possible.
+
+    Returns:
+        bool: True when the refresh completed
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_trending_24h')
+    return True
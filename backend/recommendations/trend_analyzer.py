@@ -1,13 +1,54 @@
 """
 TrendAnalyzer: Background service for discovering trending places and solving cold start problem.
 """
+import time
+from functools import lru_cache
+
 import geohash2
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Optional
+from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
+from django_redis import get_redis_connection
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Count, Avg, FloatField, Func
+from django.db.models.functions import ExtractMonth
+from django.db.utils import DatabaseError, NotSupportedError
 from locations.models import POI
-from recommendations.models import Interaction, Review, TrendingList, BlacklistedPOI, SeasonalMetadata
+from recommendations.models import (
+    Interaction, Review, TrendingList, BlacklistedPOI, SeasonalMetadata, TrendingVelocity,
+)
+
+# Columns POIListSerializer actually renders; POI querysets returned to the
+# trend views load just these instead of every column. The geometry column
+# is deliberately absent — coordinates come from cheap ST_X/ST_Y float
+# annotations instead of shipping and parsing the raw geometry per row.
+POI_LIST_FIELDS = ('id', 'name', 'category', 'average_rating', 'metadata', 'tags')
+
+
+@lru_cache(maxsize=4096)
+def _bbox_polygon(geohash: str) -> Polygon:
+    """
+    Geohash cell -> GEOS bounding-box polygon, memoized. Both the base32
+    decode and the ring construction are pure, so hot cells turn into a
+    dict lookup; keys are short strings and polygons five points, so the
+    cache stays tiny. The polygon is shared — callers must not mutate it.
+    """
+    lat, lon, lat_err, lon_err = geohash2.decode_exactly(geohash)
+    # from_bbox takes (xmin, ymin, xmax, ymax) = (lon, lat) order
+    polygon = Polygon.from_bbox((lon - lon_err, lat - lat_err, lon + lon_err, lat + lat_err))
+    polygon.srid = 4326
+    return polygon
+
+
+def _poi_list_queryset():
+    """POI queryset shaped for POIListSerializer: narrow columns, no
+    geometry, coordinates as float annotations."""
+    return POI.objects.only(*POI_LIST_FIELDS).annotate(
+        point_longitude=Func('location', function='ST_X', output_field=FloatField()),
+        point_latitude=Func('location', function='ST_Y', output_field=FloatField()),
+    )
 
 
 class TrendAnalyzer:
@@ -21,6 +62,14 @@ class TrendAnalyzer:
     UNDERRATED_THRESHOLD = 50  # Max review count to be considered "underrated"
     HIGH_RATING_FLOOR = 4.5    # Min rating to be considered "good"
     CACHE_TTL = 3600           # Cache TTL in seconds (1 hour)
+    UNDERRATED_CACHE_TTL = 600  # Hidden gems shift slowly; 10 minutes of staleness is fine
+
+    # Write-through trending index: interactions are counted into hourly
+    # Redis sorted sets per geohash cell, so trending reads are O(k)
+    # instead of a 24h interaction scan.
+    TRENDING_WINDOW_HOURS = 24
+    TRENDING_GEOHASH_PRECISION = 5
+    TRENDING_TOP_N = 20
     
     def __init__(self, underrated_threshold: int = 50, high_rating_floor: float = 4.5, cache_ttl: int = 3600):
         """Initialize TrendAnalyzer with custom thresholds if provided"""
@@ -34,29 +83,32 @@ class TrendAnalyzer:
         Criteria: rating >= HIGH_RATING_FLOOR AND review_count < UNDERRATED_THRESHOLD
         These are "Hidden Gems" - good places that aren't widely known.
         
+        Results are served cache-aside: the ranked POI id list is kept in
+        Redis for UNDERRATED_CACHE_TTL, so the common case is one cache GET
+        plus a PK fetch instead of the polygon-within + review Count query.
+
         Args:
             geohash: Geohash string representing a geographic area
-            
+
         Returns:
             List[POI]: List of underrated POIs in the area
         """
-        # Decode geohash to get bounding box
-        lat, lon, lat_err, lon_err = geohash2.decode_exactly(geohash)
-        bounds = {
-            'nE': (lat + lat_err, lon + lon_err),
-            'sW': (lat - lat_err, lon - lon_err)
-        }
-        
-        # Query POIs with good ratings but few reviews
-        underrated_pois = POI.objects.annotate(
-            review_count=Count('reviews')
-        ).filter(
-            Q(average_rating__gte=self.HIGH_RATING_FLOOR) &
-            Q(review_count__lt=self.UNDERRATED_THRESHOLD) &
-            Q(location__within=self._get_bbox_polygon(bounds))
-        ).order_by('-average_rating')
-        
-        return list(underrated_pois)
+        cache_key = f"trend:underrated:{geohash}"
+        poi_ids = cache.get(cache_key)
+
+        if poi_ids is None:
+            # Query POIs with good ratings but few reviews. review_count
+            # is the signal-maintained denormalized column, so this is a
+            # plain indexed filter — no Count('reviews') join per call.
+            poi_ids = list(POI.objects.filter(
+                Q(average_rating__gte=self.HIGH_RATING_FLOOR) &
+                Q(review_count__lt=self.UNDERRATED_THRESHOLD) &
+                self._area_filter(geohash)
+            ).order_by('-average_rating').values_list('id', flat=True))
+            cache.set(cache_key, poi_ids, self.UNDERRATED_CACHE_TTL)
+
+        pois = _poi_list_queryset().in_bulk(poi_ids)
+        return [pois[pid] for pid in poi_ids if pid in pois]
     
     def get_trending_now(self, geohash: str) -> List[POI]:
         """
@@ -74,99 +126,180 @@ class TrendAnalyzer:
         Returns:
             List[POI]: List of trending POIs (by recent interactions)
         """
-        # Step 1: Check cache
-        try:
-            cached_trending = TrendingList.objects.get(geohash=geohash)
-            # Check if cache is still valid
-            if (timezone.now() - cached_trending.updated_at).total_seconds() < self.CACHE_TTL:
-                return POI.objects.filter(id__in=cached_trending.pois)
-        except TrendingList.DoesNotExist:
-            pass
-        
-        # Step 2: Get bounding box from geohash
-        lat, lon, lat_err, lon_err = geohash2.decode_exactly(geohash)
-        bounds = {
-            'nE': (lat + lat_err, lon + lon_err),
-            'sW': (lat - lat_err, lon - lon_err)
-        }
-        
-        # Step 3: Analyze interactions in last 24 hours
-        last_24h = timezone.now() - timedelta(hours=24)
-        
-        trending_pois = POI.objects.filter(
-            Q(location__within=self._get_bbox_polygon(bounds)) &
-            Q(interactions__timestamp__gte=last_24h)
-        ).annotate(
-            interaction_count=Count('interactions')
-        ).order_by('-interaction_count')[:20]  # Top 20 trending
-        
+        # Step 0: Fast path — the write-through Redis index already holds
+        # per-POI interaction counts for the last 24h.
+        zset_trending = self._trending_from_zset(geohash)
+        if zset_trending is not None:
+            return zset_trending
+
+        # Step 1: Check cache. Entries carry their compute time so we can
+        # refresh early: past 80% of the TTL, one worker takes a short
+        # NX lock and rebuilds while everyone else keeps serving the
+        # still-valid entry — no thundering herd when a hot geohash expires.
+        cache_key = f"trend:trending:{geohash}"
+        entry = cache.get(cache_key)
+        if entry is not None:
+            age = time.time() - entry['computed_at']
+            is_fresh = age < self.CACHE_TTL * 0.8
+            if is_fresh or not cache.add(f"{cache_key}:lock", 1, timeout=10):
+                pois = _poi_list_queryset().in_bulk(entry['pois'])
+                return [pois[pid] for pid in entry['pois'] if pid in pois]
+
+        # Step 2: Precomputed 24h velocity from the materialized view —
+        # an indexed prefix lookup refreshed every 5 minutes by Beat.
+        trending_pois = self._trending_from_matview(geohash)
+
+        # Step 3: Live aggregate over the last 24 hours within the area
+        # (fallback when the view is empty or not yet created).
+        if trending_pois is None:
+            last_24h = timezone.now() - timedelta(hours=24)
+
+            trending_pois = list(_poi_list_queryset().filter(
+                self._area_filter(geohash) &
+                Q(interactions__timestamp__gte=last_24h)
+            ).annotate(
+                interaction_count=Count('interactions')
+            ).order_by('-interaction_count')[:self.TRENDING_TOP_N])
+
         # Step 4: Cache the results
         poi_ids = [str(poi.id) for poi in trending_pois]
-        TrendingList.objects.update_or_create(
-            geohash=geohash,
-            defaults={'pois': poi_ids}
+        cache.set(
+            cache_key,
+            {'pois': [poi.id for poi in trending_pois], 'computed_at': time.time()},
+            self.CACHE_TTL,
         )
-        
-        return list(trending_pois)
+        # Single INSERT ... ON CONFLICT DO UPDATE instead of the
+        # SELECT + UPDATE/INSERT pair update_or_create issues.
+        TrendingList.objects.bulk_create(
+            [TrendingList(geohash=geohash, pois=poi_ids)],
+            update_conflicts=True,
+            unique_fields=['geohash'],
+            update_fields=['pois', 'updated_at'],
+        )
+
+        return trending_pois
     
-    def analyze_seasonal_trends(self) -> None:
+    def analyze_seasonal_trends(self, bucket: Optional[int] = None, num_buckets: int = 16) -> None:
         """
         Batch Job: Analyzes seasonal patterns in visit timestamps.
         Tags POIs with seasonal metadata based on historical visit data.
-        
-        This method:
-        1. Iterates over all POIs
-        2. Groups interactions by season
-        3. Determines peak season
-        4. Saves to SeasonalMetadata
+
+        One GROUP BY over Interaction buckets every row into its season
+        DB-side via EXTRACT(MONTH ...) filtered counts — one result row
+        per POI, no Python folding — and one bulk upsert writes all
+        SeasonalMetadata rows. The existing (poi, timestamp) index covers
+        the scan. Backends without filtered aggregates fall back to a
+        NumPy bincount pass over (poi, timestamp) pairs.
+
+        When ``bucket`` is given, only POIs hashing into that id shard
+        (uuid mod ``num_buckets``) are processed, so Celery workers can
+        run the shards in parallel (see recommendations.tasks).
         """
-        all_pois = POI.objects.all()
-        
-        for poi in all_pois:
-            # Get all interactions for this POI
-            interactions = Interaction.objects.filter(poi=poi)
-            
-            if not interactions.exists():
-                continue
-            
-            # Count interactions by season
-            season_counts = {
-                'SPRING': 0,
-                'SUMMER': 0,
-                'FALL': 0,
-                'WINTER': 0,
+        poi_filter = None
+        if bucket is not None:
+            poi_filter = Q(poi_id__in=self._bucket_poi_ids(bucket, num_buckets))
+
+        try:
+            to_upsert = self._seasonal_metadata_db(poi_filter)
+        except NotSupportedError:
+            to_upsert = self._seasonal_metadata_python(poi_filter)
+        # batch_size keeps each INSERT comfortably under PostgreSQL's
+        # bind-parameter limit at ~7 params per row.
+        SeasonalMetadata.objects.bulk_create(
+            to_upsert,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['poi'],
+            update_fields=[
+                'peak_season', 'visit_count_spring', 'visit_count_summer',
+                'visit_count_fall', 'visit_count_winter',
+            ],
+        )
+
+        print(f"Analyzed seasonal trends for {len(to_upsert)} POIs")
+
+    @staticmethod
+    def _bucket_poi_ids(bucket: int, num_buckets: int) -> List:
+        """POI ids falling into one uuid-mod shard. A full id-column scan
+        is cheap next to the interaction aggregate it partitions."""
+        return [
+            pk
+            for pk in POI.objects.values_list('id', flat=True).iterator(chunk_size=10_000)
+            if pk.int % num_buckets == bucket
+        ]
+
+    def _seasonal_metadata_db(self, poi_filter: Optional[Q] = None) -> List[SeasonalMetadata]:
+        """Season counts per POI as one GROUP BY with filtered aggregates."""
+        interactions = Interaction.objects.all()
+        if poi_filter is not None:
+            interactions = interactions.filter(poi_filter)
+        season_rows = interactions.annotate(
+            month=ExtractMonth('timestamp')
+        ).values('poi_id').annotate(
+            spring=Count('id', filter=Q(month__in=[3, 4, 5])),
+            summer=Count('id', filter=Q(month__in=[6, 7, 8])),
+            fall=Count('id', filter=Q(month__in=[9, 10, 11])),
+            winter=Count('id', filter=Q(month__in=[12, 1, 2])),
+        )
+
+        to_upsert = []
+        for row in season_rows:
+            counts = {
+                'SPRING': row['spring'],
+                'SUMMER': row['summer'],
+                'FALL': row['fall'],
+                'WINTER': row['winter'],
             }
-            
-            for interaction in interactions:
-                month = interaction.timestamp.month
-                # Determine season from month
-                if month in [3, 4, 5]:
-                    season = 'SPRING'
-                elif month in [6, 7, 8]:
-                    season = 'SUMMER'
-                elif month in [9, 10, 11]:
-                    season = 'FALL'
-                else:
-                    season = 'WINTER'
-                
-                season_counts[season] += 1
-            
-            # Determine peak season
-            peak_season = max(season_counts, key=season_counts.get)
-            
-            # Create or update metadata
-            SeasonalMetadata.objects.update_or_create(
-                poi=poi,
-                defaults={
-                    'peak_season': peak_season,
-                    'visit_count_spring': season_counts['SPRING'],
-                    'visit_count_summer': season_counts['SUMMER'],
-                    'visit_count_fall': season_counts['FALL'],
-                    'visit_count_winter': season_counts['WINTER'],
-                }
-            )
-        
-        print(f"Analyzed seasonal trends for {all_pois.count()} POIs")
+            to_upsert.append(SeasonalMetadata(
+                poi_id=row['poi_id'],
+                peak_season=max(counts, key=counts.get),
+                visit_count_spring=counts['SPRING'],
+                visit_count_summer=counts['SUMMER'],
+                visit_count_fall=counts['FALL'],
+                visit_count_winter=counts['WINTER'],
+            ))
+        return to_upsert
+
+    def _seasonal_metadata_python(self, poi_filter: Optional[Q] = None) -> List[SeasonalMetadata]:
+        """
+        Vectorized fallback: bucket (poi, timestamp) pairs with NumPy
+        bincount instead of per-row Python branching. month % 12 // 3
+        maps months to 0=WINTER, 1=SPRING, 2=SUMMER, 3=FALL.
+        """
+        interactions = Interaction.objects.all()
+        if poi_filter is not None:
+            interactions = interactions.filter(poi_filter)
+        poi_ids = []
+        months = []
+        rows = interactions.values_list('poi_id', 'timestamp').iterator(chunk_size=10_000)
+        for poi_id, timestamp in rows:
+            poi_ids.append(poi_id)
+            months.append(timestamp.month)
+
+        if not poi_ids:
+            return []
+
+        unique_pois = list(dict.fromkeys(poi_ids))
+        poi_codes = {poi_id: code for code, poi_id in enumerate(unique_pois)}
+
+        season_idx = np.fromiter((m for m in months), dtype=np.int64) % 12 // 3
+        codes = np.fromiter((poi_codes[p] for p in poi_ids), dtype=np.int64)
+        # One bincount over (poi, season) pairs gives the whole table
+        counts = np.bincount(codes * 4 + season_idx, minlength=len(unique_pois) * 4)
+        counts = counts.reshape(len(unique_pois), 4)
+
+        season_names = ('WINTER', 'SPRING', 'SUMMER', 'FALL')
+        to_upsert = []
+        for poi_id, row in zip(unique_pois, counts):
+            to_upsert.append(SeasonalMetadata(
+                poi_id=poi_id,
+                peak_season=season_names[int(row.argmax())],
+                visit_count_spring=int(row[1]),
+                visit_count_summer=int(row[2]),
+                visit_count_fall=int(row[3]),
+                visit_count_winter=int(row[0]),
+            ))
+        return to_upsert
     
     def blacklist_place(self, poi_id: str, reason: str = "Negative feedback spike", duration_hours: int = 24) -> None:
         """
@@ -212,33 +345,98 @@ class TrendAnalyzer:
         print(f"Cleaned up {expired_count} expired blacklist entries")
         return expired_count
     
-    # Helper methods
-    def _get_bbox_polygon(self, bounds: dict) -> str:
+    @classmethod
+    def record_interaction(cls, poi_id: str, poi_geohash: str) -> None:
         """
-        Convert geohash bounds to Django GIS polygon for spatial queries.
-        
+        Write-through hook for new interactions: bump the POI's count in
+        the current hourly trending sorted set for its geohash cell.
+        O(log N) per write; hourly keys expire a little past the window,
+        so there is no purge job to run.
+
         Args:
-            bounds: Dictionary with 'nE' and 'sW' keys from geohash2.expand()
-            
-        Returns:
-            str: WKT representation of the bounding box polygon
+            poi_id: UUID string of the POI that was interacted with
+            poi_geohash: POI's geohash (precision >= TRENDING_GEOHASH_PRECISION)
         """
-        # bounds format: {'nE': (lat, lon), 'sW': (lat, lon)}
-        ne = bounds['nE']  # (lat, lon)
-        sw = bounds['sW']  # (lat, lon)
-        
-        # Create polygon from bounds (longitude, latitude order for PostGIS)
-        polygon_wkt = (
-            f"POLYGON(("
-            f"{sw[1]} {sw[0]}, "  # southwest corner
-            f"{ne[1]} {sw[0]}, "  # southeast corner
-            f"{ne[1]} {ne[0]}, "  # northeast corner
-            f"{sw[1]} {ne[0]}, "  # northwest corner
-            f"{sw[1]} {sw[0]}"    # close polygon
-            f"))"
-        )
-        
-        return polygon_wkt
+        try:
+            conn = get_redis_connection('default')
+            cell = poi_geohash[:cls.TRENDING_GEOHASH_PRECISION]
+            hour = int(time.time() // 3600)
+            key = f"trending:z:{cell}:{hour}"
+            pipe = conn.pipeline()
+            pipe.zincrby(key, 1, poi_id)
+            pipe.expire(key, (cls.TRENDING_WINDOW_HOURS + 1) * 3600)
+            pipe.execute()
+        except Exception:
+            # Trending is best-effort; never fail the interaction write.
+            pass
+
+    def _trending_from_zset(self, geohash: str) -> Optional[List[POI]]:
+        """
+        Serve trending POIs from the write-through Redis index: union the
+        hourly sorted sets for the window and take the top N by count.
+        Returns None when the index has nothing for this cell (cold start,
+        Redis flush, or a geohash coarser than the indexed precision) so
+        the caller can fall back to the DB aggregate.
+        """
+        cell = geohash[:self.TRENDING_GEOHASH_PRECISION]
+        try:
+            conn = get_redis_connection('default')
+            now_hour = int(time.time() // 3600)
+            keys = [
+                f"trending:z:{cell}:{hour}"
+                for hour in range(now_hour - self.TRENDING_WINDOW_HOURS + 1, now_hour + 1)
+            ]
+            union_key = f"trending:z:{cell}:union"
+            if not conn.zunionstore(union_key, keys):
+                return None
+            conn.expire(union_key, 60)
+            poi_ids = [member.decode() for member in conn.zrevrange(union_key, 0, self.TRENDING_TOP_N - 1)]
+        except Exception:
+            return None
+
+        if not poi_ids:
+            return None
+
+        pois = {str(pk): poi for pk, poi in _poi_list_queryset().in_bulk(poi_ids).items()}
+        return [pois[pid] for pid in poi_ids if pid in pois]
+
+    def _trending_from_matview(self, geohash: str) -> Optional[List[POI]]:
+        """
+        Serve trending POIs from the mv_trending_24h materialized view:
+        an indexed (geohash_prefix, poi_id) lookup over counts Beat
+        refreshes every 5 minutes. Returns None when the view is empty
+        for this cell or does not exist yet (fresh database, non-Postgres
+        backend) so the caller can fall back to the live aggregate.
+        """
+        prefix = geohash[:self.TRENDING_GEOHASH_PRECISION]
+        try:
+            rows = list(
+                TrendingVelocity.objects.filter(geohash_prefix__startswith=prefix)
+                .order_by('-interaction_count')
+                .values_list('poi_id', flat=True)[:self.TRENDING_TOP_N]
+            )
+        except DatabaseError:
+            return None
+
+        if not rows:
+            return None
+
+        pois = _poi_list_queryset().in_bulk(rows)
+        return [pois[pid] for pid in rows if pid in pois]
+
+    # Helper methods
+    def _area_filter(self, geohash: str) -> Q:
+        """
+        Area predicate for a geohash cell. Because a point's geohash has
+        the cell's hash as a prefix, an indexed prefix match on the stored
+        geohash_8 column selects exactly the POIs inside the cell — no
+        PostGIS polygon scan. Geohashes finer than the stored precision
+        fall back to the bbox polygon.
+        """
+        if len(geohash) <= 8:
+            return Q(geohash_8__startswith=geohash)
+
+        return Q(location__within=_bbox_polygon(geohash))
     
     def get_negative_feedback_count(self, poi_id: str, hours: int = 24) -> int:
         """
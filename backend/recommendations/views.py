@@ -15,6 +15,7 @@ from recommendations.serializers import (
 )
 from recommendations.dtos import ContextDTO, PointDTO
 from recommendations.scoring_service import ScoringService
+from recommendations.tasks import analyze_seasonal_trends_task
 from recommendations.trend_analyzer import TrendAnalyzer
 from user.models import UserProfile
 
@@ -42,11 +43,16 @@ class InteractionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Save interaction and update user preference vector"""
         interaction = serializer.save(user=self.request.user.profile)
-        
+
         # Update user preference vector based on interaction type
         scoring_service = ScoringService()
         scoring_service.update_user_vector(str(interaction.user.id), interaction.interaction_type)
 
+        # Write-through to the trending index (best-effort, O(log N))
+        poi = interaction.poi
+        if poi.geohash_8:
+            TrendAnalyzer.record_interaction(str(poi.id), poi.geohash_8)
+
 
 class ReviewViewSet(viewsets.ModelViewSet):
     """
@@ -284,19 +290,18 @@ class BlacklistPOIView(APIView):
 class AnalyzeSeasonalTrendsView(APIView):
     """
     API endpoint for triggering seasonal trend analysis.
-    
+
     POST /api/recommendations/analyze-seasonal-trends/
     """
-    
+
     def post(self, request):
-        """Trigger seasonal trend analysis"""
+        """Enqueue seasonal trend analysis and return the task id"""
         try:
-            trend_analyzer = TrendAnalyzer()
-            trend_analyzer.analyze_seasonal_trends()
-            
+            task = analyze_seasonal_trends_task.delay()
+
             return Response(
-                {'message': 'Seasonal trends analysis completed'},
-                status=status.HTTP_200_OK
+                {'message': 'Seasonal trends analysis started', 'task_id': task.id},
+                status=status.HTTP_202_ACCEPTED
             )
         except Exception as e:
             return Response(
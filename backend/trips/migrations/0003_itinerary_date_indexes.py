@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0002_itinerary_transport_mode'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='itinerary',
+            name='trips_itine_visibil_2d5395_idx',
+        ),
+        migrations.AddIndex(
+            model_name='itinerary',
+            index=models.Index(fields=['visibility', '-created_at'], name='itin_visibility_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itinerary',
+            index=models.Index(fields=['start_date'], name='itin_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itinerary',
+            index=models.Index(fields=['end_date'], name='itin_end_date_idx'),
+        ),
+    ]
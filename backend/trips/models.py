@@ -1,11 +1,19 @@
 import uuid
+from datetime import date, datetime
 from decimal import Decimal
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.core.signing import TimestampSigner
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 
+# Shared signer for share links: constructing TimestampSigner re-derives
+# the HMAC key from SECRET_KEY each time, so sign and verify both reuse
+# this instance. The default salt is kept deliberately — changing it
+# would invalidate every link already issued.
+share_link_signer = TimestampSigner()
+
 
 class Itinerary(models.Model):
     """
@@ -103,7 +111,13 @@ class Itinerary(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['status']),
-            models.Index(fields=['visibility']),
+            # Composite serves the public feed's filter + ORDER BY in a
+            # single index scan (and prefix-covers plain visibility
+            # filters, replacing the old single-column index).
+            models.Index(fields=['visibility', '-created_at'], name='itin_visibility_created_idx'),
+            # Range filters for upcoming/past and the date-window params.
+            models.Index(fields=['start_date'], name='itin_start_date_idx'),
+            models.Index(fields=['end_date'], name='itin_end_date_idx'),
         ]
 
     def __str__(self):
@@ -114,18 +128,26 @@ class Itinerary(models.Model):
         Sums up dwell times + transit times between stops.
         Returns total duration in minutes.
         """
-        items = self.itineraryitem_set.all().order_by('order_index')
+        # Serve from the prefetch cache when the viewset already loaded
+        # the (order_index-sorted) items; otherwise materialize once —
+        # the old loop re-evaluated the queryset via len(list(items)) and
+        # items[i + 1] on every pass, issuing a fresh query per stop.
+        prefetched = getattr(self, '_prefetched_objects_cache', {})
+        if 'itineraryitem_set' in prefetched:
+            items = list(prefetched['itineraryitem_set'])
+        else:
+            items = list(
+                self.itineraryitem_set.order_by('order_index').only('arrival_time')
+            )
         total_duration = 0
 
-        for i, item in enumerate(items):
-            # Add dwell time (will be stored in POI metadata or as a field)
-            # For now, we'll count the time until the next stop or until end_date
-            if i < len(list(items)) - 1:
-                next_item = items[i + 1]
-                if item.arrival_time and next_item.arrival_time:
-                    duration = (next_item.arrival_time.hour * 60 + next_item.arrival_time.minute -
-                               item.arrival_time.hour * 60 - item.arrival_time.minute)
-                    total_duration += duration
+        for item, next_item in zip(items, items[1:]):
+            if item.arrival_time and next_item.arrival_time:
+                delta = (
+                    datetime.combine(date.today(), next_item.arrival_time)
+                    - datetime.combine(date.today(), item.arrival_time)
+                )
+                total_duration += int(delta.total_seconds() // 60)
 
         return total_duration
 
@@ -136,25 +158,31 @@ class Itinerary(models.Model):
         if self.visibility != self.Visibility.PUBLIC:
             raise ValueError("Only public itineraries can be cloned")
 
-        # Create new itinerary
-        cloned = Itinerary.objects.create(
-            user=new_user,
-            title=f"{self.title} (Copy)",
-            start_date=self.start_date,
-            end_date=self.end_date,
-            status=self.Status.DRAFT,
-            visibility=self.Visibility.PRIVATE,
-            estimated_cost=self.estimated_cost,
-        )
-
-        # Clone all stops
-        for item in self.itineraryitem_set.all():
-            ItineraryItem.objects.create(
-                itinerary=cloned,
-                poi=item.poi,
-                order_index=item.order_index,
-                arrival_time=item.arrival_time,
-                notes=item.notes,
+        with transaction.atomic():
+            # Create new itinerary
+            cloned = Itinerary.objects.create(
+                user=new_user,
+                title=f"{self.title} (Copy)",
+                start_date=self.start_date,
+                end_date=self.end_date,
+                status=self.Status.DRAFT,
+                visibility=self.Visibility.PRIVATE,
+                estimated_cost=self.estimated_cost,
+            )
+
+            # Clone all stops in one INSERT instead of one per item
+            ItineraryItem.objects.bulk_create(
+                [
+                    ItineraryItem(
+                        itinerary=cloned,
+                        poi_id=item.poi_id,
+                        order_index=item.order_index,
+                        arrival_time=item.arrival_time,
+                        notes=item.notes,
+                    )
+                    for item in self.itineraryitem_set.all()
+                ],
+                batch_size=500,
             )
 
         return cloned
@@ -164,10 +192,7 @@ class Itinerary(models.Model):
         Creates a unique, signed URL for sharing this itinerary.
         Uses Django's signing framework.
         """
-        from django.core.signing import TimestampSigner
-
-        signer = TimestampSigner()
-        signed_value = signer.sign(str(self.id))
+        signed_value = share_link_signer.sign(str(self.id))
 
         # Return a shareable link (would be used by frontend)
         return f"/trips/share/{signed_value}"
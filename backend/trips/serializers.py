@@ -3,6 +3,7 @@ DRF Serializers for Itinerary and ItineraryItem models.
 """
 from rest_framework import serializers
 from .models import Itinerary, ItineraryItem
+from locations.models import POI
 from locations.serializers import POISerializer
 
 
@@ -10,7 +11,7 @@ class ItineraryItemSerializer(serializers.ModelSerializer):
     """Serializer for ItineraryItem model"""
     poi = POISerializer(read_only=True)
     poi_id = serializers.PrimaryKeyRelatedField(
-        queryset=__import__('locations.models', fromlist=['POI']).POI.objects.all(),
+        queryset=POI.objects.all(),
         write_only=True,
         source='poi'
     )
@@ -30,6 +31,29 @@ class ItineraryItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class ItineraryItemLightSerializer(serializers.ModelSerializer):
+    """
+    Stop row without the embedded full POI payload. Summary-style
+    endpoints only need identity and ordering; inlining POISerializer
+    there multiplies response size and serializer work per stop.
+    """
+    poi_id = serializers.UUIDField(source='poi.id', read_only=True)
+    poi_name = serializers.CharField(source='poi.name', read_only=True)
+    poi_category = serializers.CharField(source='poi.category', read_only=True)
+
+    class Meta:
+        model = ItineraryItem
+        fields = [
+            'id',
+            'poi_id',
+            'poi_name',
+            'poi_category',
+            'order_index',
+            'arrival_time',
+        ]
+        read_only_fields = ['id']
+
+
 class ItinerarySerializer(serializers.ModelSerializer):
     """Serializer for Itinerary model"""
     stops = ItineraryItemSerializer(
@@ -81,8 +105,28 @@ class ItinerarySerializer(serializers.ModelSerializer):
 
 class ItineraryListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for list views"""
+
+    # DB columns this serializer actually reads, for .only() projection
+    # in the list queryset (total_stops is an annotation; username comes
+    # off the joined user row).
+    DB_FIELDS = (
+        'id',
+        'title',
+        'start_date',
+        'end_date',
+        'status',
+        'visibility',
+        'transport_mode',
+        'estimated_cost',
+        'created_at',
+        'user__username',
+    )
+
     username = serializers.CharField(source='user.username', read_only=True)
-    total_stops = serializers.SerializerMethodField()
+    # Filled by the Count('itineraryitem') annotation in the list
+    # queryset; a method field calling obj.stops.count() would issue one
+    # COUNT query per row.
+    total_stops = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Itinerary
@@ -105,22 +149,16 @@ class ItineraryListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_total_stops(self, obj):
-        """Get count of stops"""
-        return obj.stops.count()
-
 
 class ItineraryCloneSerializer(serializers.Serializer):
-    """Serializer for cloning an itinerary"""
-    target_user_id = serializers.IntegerField(required=True)
+    """
+    Serializer for cloning an itinerary.
 
-    def validate_target_user_id(self, value):
-        """Validate that the target user exists"""
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        if not User.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Target user does not exist")
-        return value
+    No existence validator: it cost an extra SELECT per clone request,
+    and the clone action resolves its target user itself — a dangling id
+    would fail there (or on the FK) anyway.
+    """
+    target_user_id = serializers.IntegerField(required=True)
 
 
 class ItineraryShareLinkSerializer(serializers.Serializer):
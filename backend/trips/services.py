@@ -1,19 +1,23 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Dict, Any, Optional
 from enum import Enum
+import io
 import math
 import json
 import re
 import hashlib
 from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, time
 import logging
+import numpy as np
 import requests
 
 from django.db.models import Q
 from django.utils import timezone
 from django.contrib.gis.geos import Point
 from django.conf import settings
+from django.core.cache import cache
 
 from locations.models import POI
 from locations.services import ExternalSyncService
@@ -22,6 +26,71 @@ from .models import Itinerary, ItineraryItem
 
 logger = logging.getLogger(__name__)
 
+try:  # Optional accelerator; the solver falls back to NumPy when absent
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:  # Optional compiled geodesic backend for the scalar distance path
+    from pyproj import Geod
+    _GEOD = Geod(ellps='WGS84')
+except ImportError:
+    _GEOD = None
+
+
+if njit is not None:
+    # Scalar-loop TSP kernels compiled to native code. Written against
+    # contiguous float32 matrices and int32 paths so the hot loops are
+    # machine-code loads and compares with no PyObject traffic.
+
+    @njit(cache=True, fastmath=True)
+    def _nn_solve_jit(matrix):
+        n = matrix.shape[0]
+        visited = np.zeros(n, dtype=np.bool_)
+        visited[0] = True
+        path = np.empty(n, dtype=np.int32)
+        path[0] = 0
+        current = 0
+        for k in range(1, n):
+            best = -1
+            best_cost = np.inf
+            for j in range(n):
+                if not visited[j] and matrix[current, j] < best_cost:
+                    best_cost = matrix[current, j]
+                    best = j
+            path[k] = best
+            visited[best] = True
+            current = best
+        return path
+
+    @njit(cache=True, fastmath=True)
+    def _two_opt_jit(matrix, path):
+        n = path.shape[0]
+        eps = 1e-6
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, n - 2):
+                for j in range(i + 1, n - 1):
+                    delta = (
+                        matrix[path[i - 1], path[j]] + matrix[path[i], path[j + 1]]
+                        - matrix[path[i - 1], path[i]] - matrix[path[j], path[j + 1]]
+                    )
+                    if delta < -eps:
+                        lo = i
+                        hi = j
+                        while lo < hi:
+                            tmp = path[lo]
+                            path[lo] = path[hi]
+                            path[hi] = tmp
+                            lo += 1
+                            hi -= 1
+                        improved = True
+        return path
+else:
+    _nn_solve_jit = None
+    _two_opt_jit = None
+
 
 class TransportMode(Enum):
     """Enum for transport modes"""
@@ -35,10 +104,11 @@ class DistanceMatrixAPI(ABC):
     """Abstract base class for distance matrix clients"""
 
     @abstractmethod
-    def get_distance_matrix(self, locations: List[Tuple[float, float]], mode: TransportMode) -> List[List[float]]:
+    def get_distance_matrix(self, locations, mode: TransportMode) -> np.ndarray:
         """
-        Get distance matrix for a list of locations.
-        Returns: N x N matrix where cell (i, j) is travel time from location i to j
+        Get distance matrix for a sequence of (lat, lon) pairs — a list
+        of tuples or an (N, 2) ndarray.
+        Returns: N x N float32 ndarray where cell (i, j) is travel time from location i to j
         """
         pass
 
@@ -46,48 +116,153 @@ class DistanceMatrixAPI(ABC):
 class GoogleDistanceMatrixClient(DistanceMatrixAPI):
     """Google Maps Distance Matrix API client"""
 
+    # Matrices are deterministic for a stop set, so cached results stay
+    # valid for as long as traffic modelling would allow in production.
+    MATRIX_CACHE_TTL = 3600
+    # Google caps Distance Matrix requests at 100 elements; 10x10 tiles
+    # keep every tile request within that limit.
+    TILE_SIZE = 10
+    # Average speeds used to turn haversine kilometres into minutes.
+    # The old code divided by 60 km/h and multiplied by 60 min/h — a
+    # no-op that returned kilometres for every mode.
+    SPEED_KMH = {
+        'DRIVING': 60.0,
+        'WALKING': 5.0,
+        'CYCLING': 15.0,
+        'TRANSIT': 30.0,
+    }
+
     def __init__(self, api_key: str):
         self.api_key = api_key
+        # One pooled session per client: reusing connections skips the
+        # TCP/TLS handshake on every Distance Matrix request. Pool sizes
+        # cover the 8 concurrent tile fetches with headroom.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=100)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_distance_matrix(self, locations, mode: TransportMode) -> np.ndarray:
+        """
+        Distance matrix for a stop set, served through the shared cache.
+        Accepts a list of (lat, lon) tuples or an (N, 2) ndarray.
+
+        Matrices are cached under a canonical key — the coordinate pairs
+        rounded to 6 decimals and sorted, plus the mode — so repeated
+        optimizations over the same or reordered stop set hit the cache
+        regardless of input order. The cached matrix is stored in sorted
+        order and permuted back to the caller's order on the way out.
+        """
+        rounded = [(round(float(loc[0]), 6), round(float(loc[1]), 6)) for loc in locations]
+        order = sorted(range(len(rounded)), key=lambda i: rounded[i])
+        canonical = tuple(rounded[i] for i in order)
+
+        key_material = repr((canonical, mode.value)).encode('utf-8')
+        cache_key = 'dmat:' + hashlib.blake2b(key_material, digest_size=16).hexdigest()
+
+        raw = cache.get(cache_key)
+        if raw is not None:
+            canonical_matrix = np.load(io.BytesIO(raw))
+        else:
+            canonical_matrix = self._compute_matrix(canonical, mode)
+            buffer = io.BytesIO()
+            np.save(buffer, canonical_matrix)
+            cache.set(cache_key, buffer.getvalue(), self.MATRIX_CACHE_TTL)
+
+        # position of each requested location within the canonical order
+        positions = np.empty(len(order), dtype=np.intp)
+        positions[order] = np.arange(len(order))
+        return canonical_matrix[np.ix_(positions, positions)]
 
-    def get_distance_matrix(self, locations: List[Tuple[float, float]], mode: TransportMode) -> List[List[float]]:
+    def _compute_matrix(self, locations: Tuple[Tuple[float, float], ...], mode: TransportMode) -> np.ndarray:
         """
-        Placeholder for Google Distance Matrix API call.
-        In production, this would call the Google API.
+        Build the full N x N matrix from per-tile requests.
+
+        The Google API caps elements per request (10x10 = 100), so large
+        stop sets must be fetched as sub-matrix tiles anyway. Tiles are
+        dispatched concurrently on a thread pool — the production call
+        is a network round trip, so overlapping tiles hides RTT — and
+        stitched back into one float32 matrix.
         """
-        # For now, return a mock distance matrix
         n = len(locations)
-        matrix = [[0.0] * n for _ in range(n)]
+        if n <= self.TILE_SIZE:
+            return self._fetch_tile(locations, locations, mode)
+
+        matrix = np.empty((n, n), dtype=np.float32)
+        spans = [(start, min(start + self.TILE_SIZE, n)) for start in range(0, n, self.TILE_SIZE)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {
+                pool.submit(self._fetch_tile, locations[o_start:o_end], locations[d_start:d_end], mode):
+                    (o_start, o_end, d_start, d_end)
+                for o_start, o_end in spans
+                for d_start, d_end in spans
+            }
+            for future in as_completed(futures):
+                o_start, o_end, d_start, d_end = futures[future]
+                matrix[o_start:o_end, d_start:d_end] = future.result()
+        return matrix
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    # Calculate haversine distance as placeholder
-                    distance = self._haversine_distance(locations[i], locations[j])
-                    matrix[i][j] = distance
+    @classmethod
+    def _fetch_tile(cls, origins: Tuple[Tuple[float, float], ...],
+                    destinations: Tuple[Tuple[float, float], ...],
+                    mode: TransportMode) -> np.ndarray:
+        """
+        Placeholder for one origins x destinations API request. In
+        production, this would call the Google API with the two
+        coordinate lists.
 
-        return matrix
+        The origins x destinations haversine block is computed with one
+        broadcasted NumPy expression; the trig runs in C over contiguous
+        arrays instead of scalar math.sin/cos/atan2 calls.
+        """
+        lat_o = np.radians(np.array([loc[0] for loc in origins], dtype=np.float64))
+        lon_o = np.radians(np.array([loc[1] for loc in origins], dtype=np.float64))
+        lat_d = np.radians(np.array([loc[0] for loc in destinations], dtype=np.float64))
+        lon_d = np.radians(np.array([loc[1] for loc in destinations], dtype=np.float64))
+
+        dlat = lat_o[:, None] - lat_d[None, :]
+        dlon = lon_o[:, None] - lon_d[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat_o)[:, None] * np.cos(lat_d)[None, :] * np.sin(dlon / 2) ** 2
+        # arcsin form of the haversine: one sqrt instead of two plus
+        # atan2, identical for a <= 1 (clip guards float round-off).
+        c = 2 * np.arcsin(np.sqrt(a).clip(max=1.0))
+        distance_km = 6371 * c  # Earth radius in km
+
+        # Convert to travel time in minutes at the mode's average
+        # speed. float32 halves the matrix footprint; minute-scale
+        # travel times don't need float64 precision.
+        speed_kmh = cls.SPEED_KMH.get(mode.value, cls.SPEED_KMH['DRIVING'])
+        return (distance_km / speed_kmh * 60.0).astype(np.float32)
 
-    @staticmethod
-    def _haversine_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+    @classmethod
+    def _haversine_distance(cls, coord1: Tuple[float, float], coord2: Tuple[float, float],
+                            mode: TransportMode = TransportMode.DRIVING) -> float:
         """
-        Calculate haversine distance between two coordinates in kilometers.
-        Converted to minutes for travel time estimate (assuming ~60 km/h).
+        Calculate distance between two coordinates in kilometers.
+        Converted to minutes at the mode's average speed.
+
+        Routed through pyproj's Geod when installed: the geodesic solve
+        runs in compiled PROJ code on the WGS84 ellipsoid instead of
+        interpreted spherical math, gaining accuracy and speed at once.
         """
         lat1, lon1 = coord1
         lat2, lon2 = coord2
 
-        R = 6371  # Earth radius in km
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
+        if _GEOD is not None:
+            distance_km = _GEOD.inv(lon1, lat1, lon2, lat2)[2] / 1000.0
+        else:
+            R = 6371  # Earth radius in km
+            dlat = math.radians(lat2 - lat1)
+            dlon = math.radians(lon2 - lon1)
 
-        a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(
-            dlon / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        distance_km = R * c
+            a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(
+                dlon / 2) ** 2
+            c = 2 * math.asin(min(1.0, math.sqrt(a)))
+            distance_km = R * c
 
-        # Convert to travel time in minutes (assuming ~60 km/h average)
-        travel_time_minutes = (distance_km / 60) * 60
-        return travel_time_minutes
+        # Convert to travel time in minutes at the mode's average speed
+        speed_kmh = cls.SPEED_KMH.get(mode.value, cls.SPEED_KMH['DRIVING'])
+        return distance_km / speed_kmh * 60.0
 
 
 class RouteOptimizer:
@@ -96,6 +271,11 @@ class RouteOptimizer:
     Reorders a list of stops for minimal travel time.
     """
 
+    # Up to here the O(N^2 * 2^N) Held-Karp DP runs in milliseconds and
+    # returns the provably shortest route; past it the heuristics take
+    # over. 12 stops ≈ 590k DP transitions.
+    EXACT_TSP_MAX_STOPS = 12
+
     def __init__(self, matrix_client: DistanceMatrixAPI):
         """
         Initialize with a distance matrix API client.
@@ -124,57 +304,165 @@ class RouteOptimizer:
         if not self.validate_constraints(stops):
             raise ValueError("Route constraints validation failed")
 
-        # Build distance matrix from locations
-        locations = [(stop.location.y, stop.location.x) for stop in stops]
-        distance_matrix = self._build_distance_matrix(locations, mode)
-
-        # Solve TSP to find optimal order
-        optimal_indices = self._solve_tsp(distance_matrix)
+        # Pack (lat, lon) into one contiguous ndarray up front: every
+        # stop.location.y/.x access crosses the GEOS binding, so touch
+        # each Point exactly once and keep downstream code pure NumPy.
+        coords = np.fromiter(
+            (c for stop in stops for c in (stop.location.y, stop.location.x)),
+            dtype=np.float64,
+            count=2 * len(stops),
+        ).reshape(-1, 2)
+        distance_matrix = self._build_distance_matrix(coords, mode)
+
+        # Solve TSP: exact Held-Karp DP where it's cheap (covers typical
+        # itinerary sizes), nearest-neighbour + 2-opt beyond that.
+        if len(stops) <= self.EXACT_TSP_MAX_STOPS:
+            optimal_indices = self._held_karp(distance_matrix)
+        else:
+            optimal_indices = self._two_opt(distance_matrix, self._solve_tsp(distance_matrix))
 
         # Return reordered stops
         return [stops[i] for i in optimal_indices]
 
-    def _build_distance_matrix(self, locations: List[Tuple[float, float]], mode: TransportMode) -> List[List[float]]:
+    def _build_distance_matrix(self, locations: np.ndarray, mode: TransportMode) -> np.ndarray:
         """
         Constructs an N x N distance/time matrix where cell (i, j) is the travel time
         from location i to location j.
 
         Args:
-            locations: List of (latitude, longitude) tuples
+            locations: (N, 2) float64 array of (latitude, longitude) rows
             mode: Transport mode
 
         Returns:
-            Matrix of travel times in minutes
+            N x N float32 ndarray of travel times in minutes
         """
-        return self.matrix_client.get_distance_matrix(locations, mode)
+        # asarray is a no-copy pass-through for clients already returning
+        # float32 ndarrays and normalizes list-of-lists clients.
+        return np.asarray(self.matrix_client.get_distance_matrix(locations, mode), dtype=np.float32)
 
-    def _solve_tsp(self, matrix: List[List[float]]) -> List[int]:
+    def _solve_tsp(self, matrix: np.ndarray) -> List[int]:
         """
         Executes the optimization logic using nearest neighbor heuristic.
 
+        Each step masks visited stops with inf and takes argmin over the
+        current row — one C loop per step instead of a Python min() with
+        a key lambda boxing every float.
+
         Args:
-            matrix: Distance/time matrix
+            matrix: N x N float32 distance/time matrix
 
         Returns:
             List of indices representing the optimized order
         """
+        if _nn_solve_jit is not None:
+            return [int(i) for i in _nn_solve_jit(np.ascontiguousarray(matrix))]
+
         n = len(matrix)
-        unvisited = set(range(1, n))  # Start from stop 0
+        visited = np.zeros(n, dtype=bool)
+        visited[0] = True  # Start from stop 0
         current = 0
         path = [0]
 
-        while unvisited:
-            nearest = min(unvisited, key=lambda x: matrix[current][x])
-            path.append(nearest)
-            unvisited.remove(nearest)
-            current = nearest
+        for _ in range(n - 1):
+            row = matrix[current].copy()
+            row[visited] = np.inf
+            current = int(row.argmin())
+            path.append(current)
+            visited[current] = True
+
+        return path
+
+    @staticmethod
+    def _held_karp(matrix: np.ndarray) -> List[int]:
+        """
+        Exact open-tour TSP via Held-Karp bitmask DP, start fixed at
+        stop 0. dp[mask, j] is the cheapest path over the stop set
+        `mask` ending at j; each transition minimizes over predecessors
+        with one vectorized add+argmin, so the Python loop is only
+        O(2^N * N).
+
+        Args:
+            matrix: N x N float32 distance/time matrix
+
+        Returns:
+            Optimal order as a list of stop indices
+        """
+        n = matrix.shape[0]
+        full = 1 << n
+        dp = np.full((full, n), np.inf, dtype=np.float64)
+        parent = np.full((full, n), -1, dtype=np.int32)
+        dp[1, 0] = 0.0
+
+        cols = matrix.astype(np.float64).T  # cols[j] = travel times into j
+        for mask in range(3, full, 2):  # only masks containing stop 0
+            for j in range(1, n):
+                if not mask >> j & 1:
+                    continue
+                prev_mask = mask ^ (1 << j)
+                # dp is inf for stops outside prev_mask, so argmin only
+                # ever picks a valid predecessor.
+                costs = dp[prev_mask] + cols[j]
+                best = int(costs.argmin())
+                dp[mask, j] = costs[best]
+                parent[mask, j] = best
+
+        if n == 1:
+            return [0]
+
+        mask = full - 1
+        current = int(dp[mask, 1:].argmin()) + 1
+        path = []
+        while current != -1:
+            path.append(current)
+            nxt = int(parent[mask, current])
+            mask ^= 1 << current
+            current = nxt
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _two_opt(matrix: np.ndarray, path: List[int]) -> List[int]:
+        """
+        2-opt local search over an open tour: reverse any segment whose
+        endpoints can be reconnected more cheaply, repeating until no
+        swap improves. Nearest-neighbour alone can land ~25% above the
+        optimum on metric instances; 2-opt recovers most of that for an
+        O(n^2) scan per pass. Each delta is four scalar reads from the
+        float32 matrix, so passes are cache-friendly.
+
+        Args:
+            matrix: N x N float32 distance/time matrix
+            path: Tour as a list of stop indices (start fixed at path[0])
 
+        Returns:
+            Improved tour as a list of stop indices
+        """
+        if _two_opt_jit is not None:
+            out = _two_opt_jit(np.ascontiguousarray(matrix), np.asarray(path, dtype=np.int32))
+            return [int(i) for i in out]
+
+        n = len(path)
+        eps = 1e-6
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, n - 2):
+                for j in range(i + 1, n - 1):
+                    delta = (
+                        matrix[path[i - 1], path[j]] + matrix[path[i], path[j + 1]]
+                        - matrix[path[i - 1], path[i]] - matrix[path[j], path[j + 1]]
+                    )
+                    if delta < -eps:
+                        path[i:j + 1] = path[i:j + 1][::-1]
+                        improved = True
         return path
 
     def validate_constraints(self, stops: List) -> bool:
         """
         Checks if the route is feasible.
-        Validates that all stops have valid location data.
+        Validates that all stops have valid location data. Callers
+        should select_related the location so the generator below reads
+        attributes instead of issuing one deferred fetch per stop.
 
         Args:
             stops: List of POI objects
@@ -182,12 +470,26 @@ class RouteOptimizer:
         Returns:
             True if all constraints are satisfied
         """
-        for stop in stops:
-            if not stop.location:
-                return False
-            if not stop.location.valid:
-                return False
-        return True
+        return all(
+            stop.location is not None and stop.location.valid
+            for stop in stops
+        )
+
+
+# Process-wide optimizer shared across requests. The client holds a
+# pooled requests.Session, so building it per view call would pay a
+# fresh connection pool (and, in production, a TLS handshake) each time
+# and throw it away at the end of the request.
+_OPTIMIZER: Optional[RouteOptimizer] = None
+
+
+def get_route_optimizer() -> RouteOptimizer:
+    """Return the shared RouteOptimizer, creating it on first use."""
+    global _OPTIMIZER
+    if _OPTIMIZER is None:
+        api_key = getattr(settings, 'GOOGLE_PLACES_API_KEY', None) or ''
+        _OPTIMIZER = RouteOptimizer(GoogleDistanceMatrixClient(api_key))
+    return _OPTIMIZER
 
 
 class TripGenerationService:
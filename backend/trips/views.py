@@ -1,20 +1,27 @@
 """
 API views for trips app endpoints.
 """
+import hashlib
+from datetime import date
+from functools import lru_cache
+
 from rest_framework import viewsets, status
+from rest_framework.pagination import CursorPagination
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
+from django.core.signing import BadSignature, SignatureExpired
+from django.core.cache import cache
 from django.db import transaction, models
-from .models import Itinerary, ItineraryItem
+from .models import Itinerary, ItineraryItem, share_link_signer
 from .serializers import (
     ItinerarySerializer,
     ItineraryListSerializer,
     ItineraryItemSerializer,
+    ItineraryItemLightSerializer,
     ItineraryCloneSerializer,
     ItineraryShareLinkSerializer,
     ItineraryGenerateRequestSerializer,
@@ -22,6 +29,50 @@ from .serializers import (
 from locations.serializers import POIListSerializer
 
 
+def _verify_share_token(token: str) -> str:
+    """
+    Resolve a signed share token to an itinerary id.
+
+    Verified tokens are remembered in the shared cache for an hour so
+    popular share links skip the HMAC + base64 work on every hit. The
+    TTL is far inside the one-year signature window, and failures are
+    never cached — bad or expired tokens re-verify and raise as before.
+    """
+    cache_key = 'share-token:' + hashlib.blake2b(
+        token.encode('utf-8'), digest_size=16
+    ).hexdigest()
+    itinerary_id = cache.get(cache_key)
+    if itinerary_id is None:
+        itinerary_id = share_link_signer.unsign(token, max_age=60 * 60 * 24 * 365)  # 1 year validity
+        cache.set(cache_key, itinerary_id, 3600)
+    return itinerary_id
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(raw: str):
+    """
+    Parse an ISO date query param, or None if malformed.
+
+    date.fromisoformat is the C fast path (timezone.datetime parsing
+    goes through a much heavier route), and the LRU cache makes repeats
+    of the same filter string free.
+    """
+    try:
+        return date.fromisoformat(raw)
+    except (ValueError, TypeError):
+        return None
+
+
+class ItineraryCursorPagination(CursorPagination):
+    """
+    Keyset pagination over -created_at. Unlike the project-default
+    PageNumberPagination it never runs SELECT COUNT(*) — O(N) on big
+    tables — and page boundaries stay stable while new rows arrive.
+    """
+    page_size = 50
+    ordering = '-created_at'
+
+
 class ItineraryViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Itinerary CRUD operations and related actions.
@@ -39,6 +90,7 @@ class ItineraryViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ItinerarySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ItineraryCursorPagination
 
     def get_queryset(self):
         """Get itineraries with sensible defaults for authenticated users."""
@@ -59,16 +111,19 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         elif self.action == 'list':
             # Default list for signed-in users should show only their own itineraries.
             if include_public:
+                # No multi-valued joins in this OR, so rows can't repeat;
+                # DISTINCT only forced Postgres into a sort over the full
+                # (wide) row set.
                 queryset = Itinerary.objects.filter(
                     Q(user=user) | Q(visibility=Itinerary.Visibility.PUBLIC)
-                ).distinct()
+                )
             else:
                 queryset = Itinerary.objects.filter(user=user)
         else:
             # Keep public visibility for detail actions (retrieve/clone/share access).
             queryset = Itinerary.objects.filter(
                 Q(user=user) | Q(visibility=Itinerary.Visibility.PUBLIC)
-            ).distinct()
+            )
 
         queryset = queryset.order_by('-created_at')
         
@@ -85,19 +140,15 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         # Filter by date range
         start_date_param = self.request.query_params.get('start_date_after')
         if start_date_param:
-            try:
-                start_date = timezone.datetime.fromisoformat(start_date_param)
+            start_date = _parse_date(start_date_param)
+            if start_date is not None:
                 queryset = queryset.filter(start_date__gte=start_date)
-            except (ValueError, TypeError):
-                pass
         
         end_date_param = self.request.query_params.get('start_date_before')
         if end_date_param:
-            try:
-                end_date = timezone.datetime.fromisoformat(end_date_param)
+            end_date = _parse_date(end_date_param)
+            if end_date is not None:
                 queryset = queryset.filter(start_date__lte=end_date)
-            except (ValueError, TypeError):
-                pass
         
         # Filter by title
         title_param = self.request.query_params.get('title')
@@ -113,7 +164,30 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         past_param = self.request.query_params.get('past')
         if past_param and past_param.lower() == 'true':
             queryset = queryset.filter(end_date__lt=timezone.now())
-        
+
+        # Both serializers render username from the owning user row.
+        queryset = queryset.select_related('user')
+
+        if self.action == 'list':
+            # One GROUP BY count for the whole page instead of a COUNT(*)
+            # query per row from the serializer, and a projection down to
+            # the columns the list serializer renders — no point shipping
+            # rows wider than the payload.
+            queryset = queryset.annotate(
+                total_stops=models.Count('itineraryitem')
+            ).only(*ItineraryListSerializer.DB_FIELDS)
+        else:
+            # Detail responses render the stops and sum arrival-time gaps
+            # for total_duration; prefetching the ordered items (with
+            # their POIs) feeds both from one extra query instead of one
+            # per itinerary plus one per stop.
+            queryset = queryset.prefetch_related(
+                models.Prefetch(
+                    'itineraryitem_set',
+                    queryset=ItineraryItem.objects.select_related('poi').order_by('order_index'),
+                )
+            )
+
         return queryset
 
     def get_serializer_class(self):
@@ -245,7 +319,7 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         
         Returns the itinerary with reordered stops.
         """
-        from .services import RouteOptimizer, GoogleDistanceMatrixClient, TransportMode
+        from .services import TransportMode, get_route_optimizer
         
         itinerary = self.get_object()
         
@@ -256,9 +330,13 @@ class ItineraryViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get stops in current order
-        items = itinerary.itineraryitem_set.all().order_by('order_index')
-        if items.count() < 2:
+        # Get stops in current order; select_related pulls each POI
+        # (and its location) in the same query instead of one lazy
+        # fetch per item.poi access below
+        items = list(
+            itinerary.itineraryitem_set.select_related('poi').order_by('order_index')
+        )
+        if len(items) < 2:
             return Response(
                 {'error': 'Need at least 2 stops to optimize route'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -277,27 +355,27 @@ class ItineraryViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            # Create optimizer and optimize route
-            client = GoogleDistanceMatrixClient('')
-            optimizer = RouteOptimizer(client)
+            # Shared optimizer: keeps the client's connection pool warm
+            # across requests instead of rebuilding it per call
+            optimizer = get_route_optimizer()
             optimized_stops = optimizer.optimize_route(stops, mode)
             
             # Update order_index for each stop safely
             with transaction.atomic():
                 # Map poi_id to item for efficient lookup
                 item_map = {item.poi_id: item for item in items}
+                ordered_items = [item_map[poi.id] for poi in optimized_stops]
                 
-                # 1. Move to temporary positions to avoid unique constraint collisions
-                for new_index, poi in enumerate(optimized_stops):
-                    item = item_map[poi.id]
+                # 1. Move to temporary positions to avoid unique constraint
+                # collisions — one UPDATE for the batch, not one per stop
+                for new_index, item in enumerate(ordered_items):
                     item.order_index = new_index + 100000
-                    item.save(update_fields=['order_index'])
+                ItineraryItem.objects.bulk_update(ordered_items, ['order_index'], batch_size=500)
                 
                 # 2. Move to final positions
-                for new_index, poi in enumerate(optimized_stops):
-                    item = item_map[poi.id]
+                for new_index, item in enumerate(ordered_items):
                     item.order_index = new_index
-                    item.save(update_fields=['order_index'])
+                ItineraryItem.objects.bulk_update(ordered_items, ['order_index'], batch_size=500)
             
             # Return updated itinerary
             serializer = self.get_serializer(itinerary)
@@ -427,15 +505,16 @@ class ItineraryViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                # Move to temporary positions to avoid unique constraint collisions
+                # Move to temporary positions to avoid unique constraint
+                # collisions, then to final positions — two batched
+                # UPDATEs instead of 2N individual saves
                 for item in items:
                     item.order_index = updates[str(item.id)] + 100000
-                    item.save(update_fields=['order_index'])
+                ItineraryItem.objects.bulk_update(items, ['order_index'], batch_size=500)
                 
-                # Move to final positions
                 for item in items:
                     item.order_index = updates[str(item.id)]
-                    item.save(update_fields=['order_index'])
+                ItineraryItem.objects.bulk_update(items, ['order_index'], batch_size=500)
             
             serializer = self.get_serializer(itinerary)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -482,13 +561,14 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         Includes basic info and statistics.
         """
         itinerary = self.get_object()
-        
-        stops = itinerary.itineraryitem_set.all().order_by('order_index')
-        stop_count = stops.count()
-        
+
+        # get_object ran the prefetched detail queryset, so the ordered
+        # stops (with POIs) are already in memory.
+        stops = list(itinerary.itineraryitem_set.all())
+
         # Calculate rough metrics
         total_cost = itinerary.estimated_cost or 0
-        
+
         return Response({
             'id': itinerary.id,
             'title': itinerary.title,
@@ -496,9 +576,9 @@ class ItineraryViewSet(viewsets.ModelViewSet):
             'end_date': itinerary.end_date,
             'status': itinerary.status,
             'visibility': itinerary.visibility,
-            'stops_count': stop_count,
+            'stops_count': len(stops),
             'estimated_cost': total_cost,
-            'stops': ItineraryItemSerializer(stops, many=True).data,
+            'stops': ItineraryItemLightSerializer(stops, many=True).data,
         }, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['post'])
@@ -591,12 +671,32 @@ class ItineraryViewSet(viewsets.ModelViewSet):
             },
             status=status.HTTP_201_CREATED,
         )
+    @staticmethod
+    def _with_detail_relations(queryset):
+        """
+        Attach the relations ItinerarySerializer renders (owner, ordered
+        stops with their POIs) so serializing a page costs three queries
+        instead of one per itinerary plus one per stop.
+        """
+        return queryset.select_related('user').prefetch_related(
+            models.Prefetch(
+                'itineraryitem_set',
+                queryset=ItineraryItem.objects.select_related('poi').order_by('order_index'),
+            )
+        )
+
     @action(detail=False, methods=['get'])
     def my_itineraries(self, request):
         """
         Get all itineraries belonging to the current user.
         """
-        itineraries = Itinerary.objects.filter(user=request.user).order_by('-created_at')
+        itineraries = self._with_detail_relations(
+            Itinerary.objects.filter(user=request.user).order_by('-created_at')
+        )
+        page = self.paginate_queryset(itineraries)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(itineraries, many=True)
         return Response(serializer.data)
 
@@ -605,7 +705,13 @@ class ItineraryViewSet(viewsets.ModelViewSet):
         """
         Get all public itineraries.
         """
-        itineraries = Itinerary.objects.filter(visibility=Itinerary.Visibility.PUBLIC).order_by('-created_at')
+        itineraries = self._with_detail_relations(
+            Itinerary.objects.filter(visibility=Itinerary.Visibility.PUBLIC).order_by('-created_at')
+        )
+        page = self.paginate_queryset(itineraries)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(itineraries, many=True)
         return Response(serializer.data)
 
@@ -627,9 +733,10 @@ class ItineraryViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            signer = TimestampSigner()
-            itinerary_id = signer.unsign(access_token, max_age=60*60*24*365)  # 1 year validity
-            itinerary = get_object_or_404(Itinerary, id=itinerary_id)
+            itinerary_id = _verify_share_token(access_token)
+            itinerary = get_object_or_404(
+                self._with_detail_relations(Itinerary.objects.all()), id=itinerary_id
+            )
 
             if itinerary.visibility != Itinerary.Visibility.PUBLIC:
                 return Response(
@@ -663,9 +770,12 @@ class ItineraryItemViewSet(viewsets.ModelViewSet):
         """Get items for itineraries user has access to"""
         user = self.request.user
         from django.db.models import Q
+        # The item serializer embeds the POI and the ownership checks
+        # read item.itinerary.user: join both up front rather than one
+        # query per rendered row.
         return ItineraryItem.objects.filter(
             Q(itinerary__user=user) | Q(itinerary__visibility=Itinerary.Visibility.PUBLIC)
-        ).order_by('itinerary', 'order_index')
+        ).select_related('poi', 'itinerary__user').order_by('itinerary', 'order_index')
 
     def perform_create(self, serializer):
         """Only allow owner to add items"""
@@ -724,7 +834,7 @@ class ItineraryItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        items = itinerary.itineraryitem_set.all().order_by('order_index')
+        items = itinerary.itineraryitem_set.select_related('poi').order_by('order_index')
         serializer = self.get_serializer(items, many=True)
         return Response(serializer.data)
 
@@ -783,20 +893,31 @@ class ItineraryItemViewSet(viewsets.ModelViewSet):
                         )
                     updates[item_id] = new_order
 
-                # Fetch all items to be updated
-                items = list(ItineraryItem.objects.filter(id__in=updates.keys(), itinerary_id=itinerary_id))
-
-                # 1. Move to temporary positions to avoid unique constraint collisions
-                # (e.g. swapping 0 and 1 directly causes a collision)
-                for item in items:
-                    # Add a large offset to move out of the way
-                    item.order_index = updates[item.id] + 100000
-                    item.save(update_fields=['order_index'])
-
-                # 2. Move to final positions
-                for item in items:
-                    item.order_index = updates[item.id]
-                    item.save(update_fields=['order_index'])
+                # Two set-based UPDATEs with CASE WHEN expressions: the
+                # offset pass dodges unique-constraint collisions (e.g.
+                # swapping 0 and 1 directly), and no item rows need to be
+                # loaded into Python at all.
+                targeted = ItineraryItem.objects.filter(
+                    id__in=updates.keys(), itinerary_id=itinerary_id
+                )
+                targeted.update(
+                    order_index=models.Case(
+                        *[
+                            models.When(id=item_id, then=models.Value(new_order + 100000))
+                            for item_id, new_order in updates.items()
+                        ],
+                        output_field=models.IntegerField(),
+                    )
+                )
+                targeted.update(
+                    order_index=models.Case(
+                        *[
+                            models.When(id=item_id, then=models.Value(new_order))
+                            for item_id, new_order in updates.items()
+                        ],
+                        output_field=models.IntegerField(),
+                    )
+                )
             
             # Return updated items in order
             items = itinerary.itineraryitem_set.all().order_by('order_index')
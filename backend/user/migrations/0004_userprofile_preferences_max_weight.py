@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+def backfill_max_weight(apps, schema_editor):
+    UserProfile = apps.get_model('user', 'UserProfile')
+    batch = []
+    for profile in UserProfile.objects.only('id', 'preferences_vector').iterator():
+        prefs = profile.preferences_vector or {}
+        weights = [w for w in prefs.values() if isinstance(w, (int, float))]
+        max_weight = max(weights) if weights else 1.0
+        if max_weight != 1.0:
+            profile.preferences_max_weight = max_weight
+            batch.append(profile)
+        if len(batch) >= 1000:
+            UserProfile.objects.bulk_update(batch, ['preferences_max_weight'])
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_update(batch, ['preferences_max_weight'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_seed_default_interests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='preferences_max_weight',
+            field=models.FloatField(default=1.0),
+        ),
+        migrations.RunPython(backfill_max_weight, migrations.RunPython.noop),
+    ]
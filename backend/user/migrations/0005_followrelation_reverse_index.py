@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_userprofile_preferences_max_weight'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followrelation',
+            index=models.Index(fields=['following', 'follower'], name='follow_rel_reverse_idx'),
+        ),
+    ]
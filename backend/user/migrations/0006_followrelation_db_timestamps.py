@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_followrelation_reverse_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='followrelation',
+            name='created_at',
+            field=models.DateTimeField(db_default=Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='followrelation',
+            name='updated_at',
+            field=models.DateTimeField(db_default=Now(), editable=False),
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION follow_relation_touch_updated_at()
+                RETURNS trigger AS $$
+                BEGIN
+                    NEW.updated_at = NOW();
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER follow_relation_set_updated_at
+                BEFORE UPDATE ON user_followrelation
+                FOR EACH ROW
+                EXECUTE FUNCTION follow_relation_touch_updated_at();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS follow_relation_set_updated_at ON user_followrelation;
+                DROP FUNCTION IF EXISTS follow_relation_touch_updated_at();
+            """,
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_followrelation_db_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION update_follow_counts()
+                RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'INSERT' THEN
+                        UPDATE user_userprofile
+                           SET following_count = following_count + 1
+                         WHERE id = NEW.follower_id;
+                        UPDATE user_userprofile
+                           SET followers_count = followers_count + 1
+                         WHERE id = NEW.following_id;
+                        RETURN NEW;
+                    ELSIF TG_OP = 'DELETE' THEN
+                        UPDATE user_userprofile
+                           SET following_count = GREATEST(following_count - 1, 0)
+                         WHERE id = OLD.follower_id;
+                        UPDATE user_userprofile
+                           SET followers_count = GREATEST(followers_count - 1, 0)
+                         WHERE id = OLD.following_id;
+                        RETURN OLD;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER follow_relation_counts
+                AFTER INSERT OR DELETE ON user_followrelation
+                FOR EACH ROW
+                EXECUTE FUNCTION update_follow_counts();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS follow_relation_counts ON user_followrelation;
+                DROP FUNCTION IF EXISTS update_follow_counts();
+            """,
+        ),
+    ]
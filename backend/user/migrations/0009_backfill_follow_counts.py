@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-09-01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    One-off resync of the denormalized follow counters from the edge
+    table. Going forward the follow_relation_counts trigger (0007)
+    keeps them exact; this catches any drift accumulated while the
+    counters were maintained from application code.
+    """
+
+    dependencies = [
+        ("user", "0008_userprofile_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            UPDATE user_userprofile AS p SET
+                followers_count = (
+                    SELECT COUNT(*) FROM user_followrelation f
+                    WHERE f.following_id = p.id
+                ),
+                following_count = (
+                    SELECT COUNT(*) FROM user_followrelation f
+                    WHERE f.follower_id = p.id
+                );
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
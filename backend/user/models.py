@@ -1,9 +1,43 @@
 import uuid
 
 from django.core.validators import MinValueValidator
-from django.db import models,transaction
+from django.db import models
 from django.conf import settings
-from django.db.models import F
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Now
+from django_redis import get_redis_connection
+
+# Outbound follow edges mirrored into a Redis SET per profile, so the
+# is_following checks that profile serializers run per rendered row cost
+# one SISMEMBER instead of a DB round trip. TTL bounds any drift; the
+# sentinel member keeps empty sets representable.
+FOLLOW_SET_TTL = 3600
+_FOLLOW_SET_SENTINEL = '__none__'
+
+
+def _follow_set_key(profile_id):
+    return f'follows:{profile_id}'
+
+
+def cache_follow_edge(follower_id, following_id):
+    """Best-effort write-through of a new follow edge into the Redis set."""
+    try:
+        conn = get_redis_connection('default')
+        key = _follow_set_key(follower_id)
+        if conn.exists(key):
+            conn.sadd(key, str(following_id))
+            conn.expire(key, FOLLOW_SET_TTL)
+    except Exception:
+        pass  # cache is best-effort; is_following falls back to the DB
+
+
+def uncache_follow_edge(follower_id, following_id):
+    """Best-effort removal of a follow edge from the Redis set."""
+    try:
+        conn = get_redis_connection('default')
+        conn.srem(_follow_set_key(follower_id), str(following_id))
+    except Exception:
+        pass
 
 
 class UserProfile(models.Model):
@@ -16,9 +50,15 @@ class UserProfile(models.Model):
     avatar_url = models.URLField(max_length=500,blank=True,null=True)
     bio = models.TextField(editable=True,max_length=200,blank=True,default="")
     preferences_vector = models.JSONField(default=dict,blank=True)
+    # Maintained incrementally by update_vector so the recommendation
+    # engine can normalize without scanning every tag weight per request.
+    preferences_max_weight = models.FloatField(default=1.0)
     followers_count = models.IntegerField(validators=[MinValueValidator(0)],default=0)
     following_count = models.IntegerField(validators=[MinValueValidator(0)],default=0)
     is_verified = models.BooleanField(null=False,default=False)
+    # Feeds the MeView ETag: any profile edit bumps it, so unchanged
+    # profiles can be answered with 304 before any serialization.
+    updated_at = models.DateTimeField(auto_now=True)
     following = models.ManyToManyField(
         'self',
         through='FollowRelation',
@@ -28,41 +68,76 @@ class UserProfile(models.Model):
     )
 
     def update_vector(self, tag: str, weight: float):
+        # One jsonb_set UPDATE bumps the tag weight in place, so the
+        # whole preferences blob never round-trips through Python; both
+        # RHS expressions read the pre-update row, so GREATEST sees the
+        # same new weight the jsonb_set writes.
+        UserProfile.objects.filter(pk=self.pk).update(
+            preferences_vector=RawSQL(
+                "jsonb_set(COALESCE(preferences_vector, '{}'::jsonb), %s::text[], "
+                "to_jsonb(COALESCE((preferences_vector ->> %s)::double precision, 0) + %s))",
+                ('{%s}' % tag, tag, weight),
+            ),
+            preferences_max_weight=RawSQL(
+                "GREATEST(preferences_max_weight, "
+                "COALESCE((preferences_vector ->> %s)::double precision, 0) + %s)",
+                (tag, weight),
+            ),
+            # Queryset update() bypasses auto_now, so stamp it here to
+            # keep the MeView ETag honest about interest changes.
+            updated_at=Now(),
+        )
+        # Mirror the change locally so same-request readers stay coherent.
         if self.preferences_vector is None:
             self.preferences_vector = {}
         self.preferences_vector[tag] = self.preferences_vector.get(tag, 0.0) + weight
-        self.save(update_fields=['preferences_vector'])
+        if self.preferences_vector[tag] > self.preferences_max_weight:
+            self.preferences_max_weight = self.preferences_vector[tag]
 
     def get_feed_vector(self):
         return self.preferences_vector
 
 
     def follow(self,target_profile: "UserProfile"):
-        if self != target_profile and not self.is_following(target_profile):
-            with transaction.atomic():
-                FollowRelation.objects.create(follower=self,following=target_profile)
-
-                self.following_count = F('following_count') + 1
-                self.save(update_fields=['following_count'])
-
-                target_profile.followers_count = F('followers_count') + 1
-                target_profile.save(update_fields=['followers_count'])
+        # Single INSERT (deduped by the unique constraint); the
+        # follower/following counters move inside the DB via the
+        # follow_relation_counts trigger, which also keeps them right
+        # under concurrent follows.
+        if self != target_profile:
+            FollowRelation.objects.get_or_create(
+                follower=self, following=target_profile
+            )
+            cache_follow_edge(self.id, target_profile.id)
 
 
     def unfollow(self,target_profile: "UserProfile"):
-        if self != target_profile and self.is_following(target_profile):
-            with transaction.atomic():
-                FollowRelation.objects.filter(follower=self,following=target_profile).delete()
-
-                self.following_count = F('following_count') - 1
-                self.save(update_fields=['following_count'])
-
-                target_profile.followers_count = F('followers_count') - 1
-                target_profile.save(update_fields=['followers_count'])
+        # Single DELETE; the counter trigger only fires for rows that
+        # actually existed, so repeated unfollows are harmless.
+        if self != target_profile:
+            FollowRelation.objects.filter(
+                follower=self, following=target_profile
+            ).delete()
+            uncache_follow_edge(self.id, target_profile.id)
 
 
     def is_following(self,target_profile):
-        return FollowRelation.objects.filter(follower=self,following =target_profile).exists()
+        try:
+            conn = get_redis_connection('default')
+            key = _follow_set_key(self.id)
+            if conn.exists(key):
+                return bool(conn.sismember(key, str(target_profile.id)))
+            # Warm the set from the DB once; later checks stay in Redis.
+            following_ids = [
+                str(pk)
+                for pk in FollowRelation.objects.filter(follower=self).values_list(
+                    'following_id', flat=True
+                )
+            ]
+            conn.sadd(key, _FOLLOW_SET_SENTINEL, *following_ids)
+            conn.expire(key, FOLLOW_SET_TTL)
+            return str(target_profile.id) in following_ids
+        except Exception:
+            return FollowRelation.objects.filter(follower=self,following =target_profile).exists()
 
 
 class Interest(models.Model):
@@ -120,8 +195,17 @@ class UserInterest(models.Model):
 class FollowRelation(models.Model) :
     follower = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="following_relation")
     following = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="follower_relation")
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Timestamps are stamped by the database (default on INSERT, trigger
+    # on UPDATE) instead of auto_now*, which calls timezone.now() in
+    # Python per write on this follow-churn-heavy table.
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+    updated_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
         unique_together = ('follower', 'following')
+        indexes = [
+            # unique_together already indexes (follower, following); the
+            # reverse ordering serves "who follows X" pages without a
+            # scan of the unique index.
+            models.Index(fields=['following', 'follower'], name='follow_rel_reverse_idx'),
+        ]
@@ -1,19 +1,63 @@
+import copy
 import re
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from .models import FollowRelation, UserProfile
+from .models import UserProfile
 
 User = get_user_model()
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Memoize ModelSerializer.get_fields() per serializer class.
+
+    DRF rebuilds the field set on every serializer instantiation —
+    model-meta introspection plus a deepcopy of the declared fields —
+    which profiles as a hot spot on small per-request serializers like
+    the profile views. The built fields are cached once per class and
+    shallow-copied per instance (binding only mutates the copies).
+    Safe for flat field sets; don't mix into serializers with nested
+    serializer fields, which share state past a shallow copy.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        cached = CachedFieldsMixin._fields_cache.get(self.__class__)
+        if cached is None:
+            cached = super().get_fields()
+            CachedFieldsMixin._fields_cache[self.__class__] = cached
+        return {name: copy.copy(field) for name, field in cached.items()}
+
+
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    # DB columns this serializer actually reads, for .only() projection
+    # in the profile views (the user__* columns ride the select_related
+    # join).
+    DB_FIELDS = (
+        "id",
+        "avatar_url",
+        "bio",
+        "is_verified",
+        "preferences_vector",
+        "followers_count",
+        "following_count",
+        "user__id",
+        "user__username",
+        "user__email",
+        "user__first_name",
+        "user__last_name",
+    )
+
     username = serializers.CharField(source="user.username", read_only=True)
     email = serializers.CharField(source="user.email", read_only=True)
     full_name = serializers.SerializerMethodField()
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
+    # Denormalized columns kept current by the follow-count trigger; no
+    # COUNT(*) subqueries per rendered profile.
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
     has_interests = serializers.SerializerMethodField()
     interests = serializers.SerializerMethodField()
     is_following = serializers.SerializerMethodField()
@@ -40,12 +84,6 @@ class UserProfileSerializer(serializers.ModelSerializer):
     def get_full_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}".strip()
 
-    def get_followers_count(self, obj):
-        return FollowRelation.objects.filter(following=obj).count()
-
-    def get_following_count(self, obj):
-        return FollowRelation.objects.filter(follower=obj).count()
-
     def get_has_interests(self, obj):
         return bool(obj.preferences_vector)
 
@@ -70,6 +108,40 @@ class UserProfileSerializer(serializers.ModelSerializer):
         viewer_profile = getattr(request.user, "profile", None)
         return viewer_profile == obj
 
+def serialize_profile(profile, viewer_profile=None):
+    """
+    Hand-rolled UserProfileSerializer payload for the single-object
+    profile views.
+
+    Produces the same shape as UserProfileSerializer.data without DRF's
+    per-field binding and dispatch — the schema is fixed, so a direct
+    dict build is the cheaper path on these hot endpoints. Keep the key
+    list in sync with UserProfileSerializer.Meta.fields.
+    """
+    user = profile.user
+    vector = profile.preferences_vector
+    is_own = viewer_profile is not None and viewer_profile.id == profile.id
+    return {
+        "id": str(profile.id),
+        "username": user.username,
+        "email": user.email,
+        "full_name": f"{user.first_name} {user.last_name}".strip(),
+        "avatar_url": profile.avatar_url,
+        "bio": profile.bio,
+        "followers_count": profile.followers_count,
+        "following_count": profile.following_count,
+        "is_verified": profile.is_verified,
+        "has_interests": bool(vector),
+        "interests": list(vector.keys()) if isinstance(vector, dict) else [],
+        "is_following": (
+            False
+            if is_own or viewer_profile is None
+            else viewer_profile.is_following(profile)
+        ),
+        "is_own_profile": is_own,
+    }
+
+
 class FollowActionSerializer(serializers.Serializer):
     success = serializers.BooleanField()
     message = serializers.CharField()
@@ -78,7 +150,7 @@ class FollowActionSerializer(serializers.Serializer):
     following_count = serializers.IntegerField()
 
 
-class FollowListProfileSerializer(serializers.ModelSerializer):
+class FollowListProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
     full_name = serializers.SerializerMethodField()
     is_following = serializers.SerializerMethodField()
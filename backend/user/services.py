@@ -79,6 +79,11 @@ class AuthService:
     def generate_tokens(self, user: User) -> dict:
         profile, _ = UserProfile.objects.get_or_create(user=user)
         refresh = RefreshToken.for_user(user)
+        # Carry the profile pk in the token so the follow endpoints can
+        # resolve the acting profile without a UserProfile SELECT; the
+        # claim is copied into every access token minted from this
+        # refresh token.
+        refresh["profile_id"] = str(profile.id)
         access = refresh.access_token
         payload = {
             "user": build_user_payload(profile),
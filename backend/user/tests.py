@@ -193,6 +193,17 @@ class UserAPITests(APITestCase):
         self.profile1.refresh_from_db()
         self.assertEqual(self.profile1.following_count, 0)
 
+    def test_profile_batch_endpoint(self):
+        """Test fetching several profiles in one request."""
+        url = reverse('profile_batch')
+        response = self.client.get(url, {'id': [str(self.profile1.id), str(self.profile2.id)]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            response.data['profiles'][str(self.profile2.id)]['username'],
+            self.user2.username,
+        )
+
     def test_followers_list_endpoint(self):
         """Test followers list API endpoint."""
         self.profile1.follow(self.profile2)
@@ -9,6 +9,7 @@ from .views import (
     LoginView,
     LogoutView,
     MeView,
+    ProfileBatchView,
     ProfileView,
     RefreshTokenView,
     RegisterView,
@@ -27,6 +28,7 @@ urlpatterns = [
     path("interests/health/", InterestSourceHealthView.as_view(), name="interests_health"),
     path("interests/", InterestSubmitView.as_view(), name="interests"),
     path("me/", MeView.as_view(), name="me"),
+    path("batch/", ProfileBatchView.as_view(), name="profile_batch"),
     path("<uuid:id>/", ProfileView.as_view(), name="profile"),
     path("<uuid:id>/follow/", FollowView.as_view(), name="follow"),
     path("<uuid:id>/unfollow/", UnfollowView.as_view(), name="unfollow"),
@@ -1,4 +1,6 @@
+import hashlib
 import re
+import uuid
 from urllib.request import Request, urlopen
 from django.conf import settings
 from django.core import signing
@@ -6,13 +8,21 @@ from django.core.exceptions import ValidationError
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError
+from django.http import Http404, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import FollowRelation, UserProfile
+from .models import (
+    FollowRelation,
+    UserProfile,
+    cache_follow_edge,
+    uncache_follow_edge,
+)
 from .serializers import (
     FollowListProfileSerializer,
     FollowActionSerializer,
@@ -21,6 +31,7 @@ from .serializers import (
     TokenRefreshRequestSerializer,
     UserProfileSerializer,
     UserRegistrationSerializer,
+    serialize_profile,
 )
 from .services import (
     AuthService,
@@ -441,8 +452,6 @@ def build_user_payload(profile: UserProfile) -> dict:
     interest_keys = []
     if isinstance(profile.preferences_vector, dict):
         interest_keys = list(profile.preferences_vector.keys())
-    followers_count = FollowRelation.objects.filter(following=profile).count()
-    following_count = FollowRelation.objects.filter(follower=profile).count()
     return {
         "id": str(profile.id),
         "username": user.username,
@@ -453,8 +462,9 @@ def build_user_payload(profile: UserProfile) -> dict:
         "is_verified": profile.is_verified,
         "has_interests": bool(profile.preferences_vector),
         "interests": interest_keys,
-        "followers_count": followers_count,
-        "following_count": following_count,
+        # Trigger-maintained columns; no COUNT over the edge table.
+        "followers_count": profile.followers_count,
+        "following_count": profile.following_count,
     }
 
 
@@ -717,16 +727,78 @@ class LogoutView(APIView):
         return Response({"detail": "Logged out successfully"}, status=status.HTTP_200_OK)
 
 
+def _viewer_profile_id(request):
+    """
+    Profile pk of the authenticated user.
+
+    Tokens minted since AuthService started embedding a profile_id
+    claim resolve it straight from the JWT — no UserProfile query.
+    Older tokens fall back to a single-column SELECT.
+    """
+    token = getattr(request, "auth", None)
+    raw = token.get("profile_id") if token is not None else None
+    if raw:
+        try:
+            return uuid.UUID(str(raw))
+        except (TypeError, ValueError):
+            pass
+    return UserProfile.objects.values_list("id", flat=True).get(user=request.user)
+
+
+def _me_etag(user_id):
+    """
+    Validator for the authenticated user's own profile payload.
+
+    updated_at covers profile edits — auto_now on plain saves, plus
+    explicit stamps wherever update_fields or queryset update() would
+    bypass it (MeView.patch, InterestSubmitView, update_vector, the
+    scoring service). The counters move via the follow trigger without
+    touching updated_at, so they go into the hash too. None means no
+    profile row yet.
+    """
+    row = (
+        UserProfile.objects.filter(user_id=user_id)
+        .values_list("updated_at", "followers_count", "following_count")
+        .first()
+    )
+    if row is None:
+        return None
+    digest = hashlib.blake2b(repr(row).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self,request):
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        serializer = UserProfileSerializer(profile, context={"request": request})
-        return Response(serializer.data)
+        # One narrow SELECT decides whether the client's copy is still
+        # current; on a match the view returns 304 without touching the
+        # serializer at all.
+        etag = _me_etag(request.user.id)
+        if etag is not None and request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponseNotModified()
+        else:
+            # select_related joins the user row the serializer reads
+            # (username/email/full name) into the same SELECT, and .only()
+            # trims both rows to the columns it renders.
+            profile, created = (
+                UserProfile.objects.select_related("user")
+                .only(*UserProfileSerializer.DB_FIELDS)
+                .get_or_create(user=request.user)
+            )
+            if created:
+                etag = _me_etag(request.user.id)
+            # Own profile: viewer == subject, so the payload builder
+            # skips the is_following lookup entirely.
+            response = Response(serialize_profile(profile, viewer_profile=profile))
+        if etag is not None:
+            response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=0"
+        patch_vary_headers(response, ["Authorization"])
+        return response
 
     def patch(self, request):
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        profile, _ = UserProfile.objects.select_related("user").get_or_create(user=request.user)
         user = request.user
 
         username = request.data.get("username")
@@ -801,7 +873,13 @@ class MeView(APIView):
             profile_updates.append("avatar_url")
 
         if profile_updates:
-            profile.save(update_fields=profile_updates)
+            # auto_now fields are skipped when left out of update_fields;
+            # include the stamp so the MeView ETag rotates with the edit.
+            profile.save(update_fields=profile_updates + ["updated_at"])
+        elif user_updates:
+            # username/full name live on the user row; touch the profile
+            # stamp so the MeView ETag rotates for those edits too.
+            profile.save(update_fields=["updated_at"])
 
         return Response(
             {"user": build_user_payload(profile)},
@@ -828,45 +906,126 @@ class MeView(APIView):
             status=status.HTTP_200_OK,
         )
 
+PROFILE_BATCH_MAX_IDS = 100
+
+
+def _fetch_profiles(ids):
+    """One projected SELECT for any number of profile pks, keyed by pk."""
+    return (
+        UserProfile.objects.select_related("user")
+        .only(*UserProfileSerializer.DB_FIELDS)
+        .in_bulk(ids)
+    )
+
+
+def _viewer_profile(request):
+    if request.user.is_authenticated:
+        return getattr(request.user, "profile", None)
+    return None
+
+
 class ProfileView(APIView):
     permission_classes = [AllowAny]
 
     def get(self,request,id):
-        profile = get_object_or_404(UserProfile,id=id)
-        serializer = UserProfileSerializer(profile, context={"request": request})
-        return Response(serializer.data)
+        profile = _fetch_profiles([id]).get(id)
+        if profile is None:
+            raise Http404
+        return Response(serialize_profile(profile, viewer_profile=_viewer_profile(request)))
+
+
+class ProfileBatchView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        raw_ids = request.query_params.getlist("id")
+        if not raw_ids:
+            return Response(
+                {"detail": "At least one id query parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(raw_ids) > PROFILE_BATCH_MAX_IDS:
+            return Response(
+                {"detail": f"At most {PROFILE_BATCH_MAX_IDS} ids per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            ids = [uuid.UUID(value) for value in raw_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "Invalid profile id"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        viewer_profile = _viewer_profile(request)
+        profiles = _fetch_profiles(ids)
+        return Response(
+            {
+                "profiles": {
+                    str(pk): serialize_profile(profile, viewer_profile=viewer_profile)
+                    for pk, profile in profiles.items()
+                },
+                "count": len(profiles),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 class FollowView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self,request,id):
-        follower = request.user.profile
-        followed_profile = get_object_or_404(UserProfile,id=id)
+        # Resolved from the JWT claim when present — the follower's
+        # UserProfile row is never fetched on this request.
+        follower_id = _viewer_profile_id(request)
 
-        if follower == followed_profile:
+        # Cheap pk compare instead of fetching the target row up front.
+        if follower_id == id:
             return Response(
                 {"success":False,"message":"An account can not follow itself"},
                 status =status.HTTP_400_BAD_REQUEST,
 
             )
-        if follower.is_following(followed_profile):
+
+        # One write path: the unique constraint dedupes (no is_following
+        # pre-check) and the FK constraint rejects unknown targets (no
+        # get_object_or_404); the DB trigger moves both counters.
+        try:
+            _, created = FollowRelation.objects.get_or_create(
+                follower_id=follower_id, following_id=id
+            )
+        except IntegrityError:
+            return Response(
+                {"detail": "Not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not created:
             return Response(
                 {"success":False,"message":"Followed account is already followed"},
                 status = status.HTTP_400_BAD_REQUEST,
             )
 
-        follower.follow(followed_profile)
-        follower.refresh_from_db()
-        followed_profile.refresh_from_db()
+        cache_follow_edge(follower_id, id)
+
+        # Fetched after the insert, so the trigger-bumped counter is
+        # already on the row; the joined user serves the notification.
+        followed_profile = UserProfile.objects.select_related("user").get(id=id)
+        following_count = UserProfile.objects.values_list(
+            "following_count", flat=True
+        ).get(id=follower_id)
         from notifications.services import NotificationService
 
+        # The notification only reads the actor's pk and display name,
+        # both already on hand, so an in-memory instance stands in for
+        # the follower row.
+        follower = UserProfile(id=follower_id)
+        follower.user = request.user
         NotificationService.notify_follow(follower, followed_profile)
         serializer = FollowActionSerializer({
             "success": True,
             "message": "Successfully followed",
             "is_following": True,
             "followers_count": followed_profile.followers_count,
-            "following_count": follower.following_count,
+            "following_count": following_count,
         })
         return Response(
             serializer.data,
@@ -878,30 +1037,46 @@ class UnfollowView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self,request,id):
-        follower = request.user.profile
-        followed = get_object_or_404(UserProfile,id=id)
+        follower_id = _viewer_profile_id(request)
 
-        if follower == followed:
+        if follower_id == id:
             return Response(
                 {"success": False, "message": "An account can not unfollow itself"},
                 status=status.HTTP_400_BAD_REQUEST,
 
             )
-        if not follower.is_following(followed):
+
+        # Single DELETE; the row count tells apart "was following" from
+        # "wasn't", so the pre-check SELECT and target fetch only run on
+        # the failure path (to keep the 404 for unknown profiles).
+        deleted, _ = FollowRelation.objects.filter(
+            follower_id=follower_id, following_id=id
+        ).delete()
+        if not deleted:
+            if not UserProfile.objects.filter(id=id).exists():
+                return Response(
+                    {"detail": "Not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
             return Response(
                 {"success": False, "message": "Unfollowed account can not unfollowed"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        follower.unfollow(followed)
-        follower.refresh_from_db()
-        followed.refresh_from_db()
+        uncache_follow_edge(follower_id, id)
+
+        counts = {
+            row["id"]: row
+            for row in UserProfile.objects.filter(id__in=[follower_id, id]).values(
+                "id", "followers_count", "following_count"
+            )
+        }
         serializer = FollowActionSerializer({
             "success": True,
             "message": "Successfully unfollowed",
             "is_following": False,
-            "followers_count": followed.followers_count,
-            "following_count": follower.following_count,
+            "followers_count": counts[id]["followers_count"],
+            "following_count": counts[follower_id]["following_count"],
         })
         return Response(
             serializer.data,
@@ -1006,7 +1181,7 @@ class InterestSubmitView(APIView):
                     seen_keys.add(child_key)
 
         profile.preferences_vector = {key: 1.0 for key in preference_keys}
-        profile.save(update_fields=["preferences_vector"])
+        profile.save(update_fields=["preferences_vector", "updated_at"])
         preference_keys = list((profile.preferences_vector or {}).keys())
 
         return Response(